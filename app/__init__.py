@@ -38,9 +38,14 @@ def create_app(config_obj=None) -> Flask:
         app.config.from_object(config_obj)
     initialize_extentions(app)
     register_blueprints(app)
+    register_commands(app)
 
     with app.app_context():
         sqlalchemy.create_all()
+        if app.config.get("SQL_PROFILING"):
+            from app.profiling import init_profiling
+
+            init_profiling(app, sqlalchemy.engine)
     return app
 
 
@@ -67,3 +72,17 @@ def register_blueprints(app):
     from app.api import api
 
     app.register_blueprint(api)
+
+
+def register_commands(app):
+    """
+    Registers the maintenance commands run with ``flask <command>``.
+
+    Args:
+        app: The Flask application instance.
+    """
+    from app.partitions import partition_transactions_command
+    from app.tenant_status import refresh_tenant_status_command
+
+    app.cli.add_command(partition_transactions_command)
+    app.cli.add_command(refresh_tenant_status_command)
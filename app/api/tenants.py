@@ -1,12 +1,38 @@
-from flask import jsonify
+from flask import jsonify, request
 
 from app import sqlalchemy as db
 from app.api import api
 from app.repository.tenants import TenantRepository
+from app.validation import batch_response, parse_batch_request, parse_search_request
 
 
 @api.route("/tenants/<int:tenant_id>/transactions")
 def get_tenant_transaction(tenant_id):
     tenant_repo = TenantRepository(db.session)
-    tenant_info = tenant_repo.get(tenant_id)
+    tenant_info = tenant_repo.get(tenant_id, period=request.args.get("period"))
     return jsonify(tenant_info)
+
+
+@api.route("/tenants/search")
+def search_tenants():
+    try:
+        filters, limit = parse_search_request(request.args)
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+    tenant_repo = TenantRepository(db.session)
+    return jsonify(tenant_repo.search(limit=limit, **filters))
+
+
+@api.route("/tenants/transactions", methods=["POST"])
+def get_tenants_transactions():
+    """
+    Fetches the transactions of several tenants given by ``ids`` and/or
+    ``codes`` in the JSON body, optionally restricted to a ``period``.
+    """
+    try:
+        ids, codes, period = parse_batch_request(request.get_json(silent=True))
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+    tenant_repo = TenantRepository(db.session)
+    tenants = tenant_repo.get_many(ids=ids, codes=codes, period=period)
+    return jsonify(batch_response(ids, codes, tenants))
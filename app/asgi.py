@@ -0,0 +1,165 @@
+"""
+ASGI entrypoint serving the API with an async SQLAlchemy engine.
+
+Run it with ``uvicorn --factory app.asgi:create_asgi_app``.
+"""
+import json
+import os
+from contextlib import asynccontextmanager
+
+from flask.json.provider import DefaultJSONProvider
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Route
+
+from app import config
+from app.config import BASE_DIR
+from app.models import db
+from app.repository.tenants import AsyncTenantRepository
+from app.validation import batch_response, parse_batch_request, parse_search_request
+
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+INSTANCE_PATH = os.path.join(os.path.dirname(BASE_DIR), "instance")
+
+
+def make_async_url(url: str) -> str:
+    """
+    Converts a synchronous database URL into its async driver equivalent.
+
+    Relative SQLite paths are resolved against the ``instance`` folder, the
+    same way Flask-SQLAlchemy does for the Flask application.
+
+    Args:
+        url: The database URL used by the Flask application.
+
+    Returns:
+        The database URL to use with the async engine.
+    """
+    url = make_url(url)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for database '{backend}'")
+    url = url.set(drivername=ASYNC_DRIVERS[backend])
+    if backend == "sqlite" and url.database and url.database != ":memory:":
+        if not os.path.isabs(url.database):
+            url = url.set(database=os.path.join(INSTANCE_PATH, url.database))
+    return url.render_as_string(hide_password=False)
+
+
+def create_async_db_engine(config_obj) -> AsyncEngine:
+    """
+    Creates the async engine described by a configuration object.
+
+    Args:
+        config_obj: The configuration object holding the database settings.
+
+    Returns:
+        The async SQLAlchemy engine.
+    """
+    url = config_obj.SQLALCHEMY_ASYNC_DATABASE_URI or make_async_url(
+        config_obj.SQLALCHEMY_DATABASE_URI
+    )
+    engine_options = {}
+    if make_url(url).get_backend_name() != "sqlite":
+        engine_options["pool_size"] = config_obj.ASYNC_POOL_SIZE
+    return create_async_engine(url, **engine_options)
+
+
+def json_response(data, status_code=200) -> Response:
+    """
+    Builds a JSON response encoded the same way as Flask's ``jsonify``.
+    """
+    body = json.dumps(
+        data,
+        default=DefaultJSONProvider.default,
+        sort_keys=DefaultJSONProvider.sort_keys,
+        separators=(",", ":"),
+    )
+    return Response(body + "\n", status_code, media_type="application/json")
+
+
+async def get_tenant_transaction(request: Request) -> Response:
+    async with request.app.state.session_factory() as session:
+        tenant_repo = AsyncTenantRepository(session)
+        tenant_info = await tenant_repo.get(
+            request.path_params["tenant_id"], period=request.query_params.get("period")
+        )
+    return json_response(tenant_info)
+
+
+async def search_tenants(request: Request) -> Response:
+    try:
+        filters, limit = parse_search_request(request.query_params)
+    except ValueError as exc:
+        return json_response({"error": str(exc)}, 400)
+    async with request.app.state.session_factory() as session:
+        tenants = await AsyncTenantRepository(session).search(limit=limit, **filters)
+    return json_response(tenants)
+
+
+async def get_tenants_transactions(request: Request) -> Response:
+    try:
+        payload = await request.json()
+    except ValueError:
+        payload = None
+    try:
+        ids, codes, period = parse_batch_request(payload)
+    except ValueError as exc:
+        return json_response({"error": str(exc)}, 400)
+    async with request.app.state.session_factory() as session:
+        tenants = await AsyncTenantRepository(session).get_many(
+            ids=ids, codes=codes, period=period
+        )
+    return json_response(batch_response(ids, codes, tenants))
+
+
+def create_asgi_app(config_obj=None) -> Starlette:
+    """
+    Creates the ASGI application exposing the same endpoints as the Flask app.
+
+    Args:
+        config_obj: An optional configuration object to load configuration from.
+        If None, the default configuration is used.
+
+    Returns:
+        The configured ASGI application.
+    """
+    if config_obj is None:
+        config_obj = config
+    engine = create_async_db_engine(config_obj)
+
+    @asynccontextmanager
+    async def lifespan(app):
+        async with engine.begin() as conn:
+            await conn.run_sync(db.metadata.create_all)
+        yield
+        await engine.dispose()
+
+    routes = [
+        Route(
+            "/api/v1/tenants/{tenant_id:int}/transactions", get_tenant_transaction
+        ),
+        Route("/api/v1/tenants/search", search_tenants),
+        Route(
+            "/api/v1/tenants/transactions", get_tenants_transactions, methods=["POST"]
+        ),
+    ]
+    middleware = [
+        Middleware(CORSMiddleware, allow_origins=["*"]),
+    ]
+    app = Starlette(
+        routes=routes,
+        middleware=middleware,
+        lifespan=lifespan,
+    )
+    app.state.engine = engine
+    app.state.session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    return app
@@ -16,9 +16,25 @@ class Config(object):
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     DATABASE_CONNECT_OPTIONS = {}
     SQLALCHEMY_DATABASE_URI = os.environ.get("DATABASE_URL")
+    # Optional explicit URL for the ASGI server, derived from the one above if unset
+    SQLALCHEMY_ASYNC_DATABASE_URI = os.environ.get("ASYNC_DATABASE_URL")
+    ASYNC_POOL_SIZE = int(os.environ.get("ASYNC_POOL_SIZE", 20))
     THREADS_PER_PAGE = 2
     SECRET_KEY = os.environ["SECRET_KEY"]
     UPLOAD_EXTENSIONS = [".xlsx", ".xls"]
+    # Default granularity of flask partition-transactions: "monthly" or "yearly"
+    TRANSACTION_PARTITIONING = os.environ.get("TRANSACTION_PARTITIONING")
+    # Per-request SQL profiling with Server-Timing headers
+    SQL_PROFILING = os.environ.get("SQL_PROFILING", "").lower() in ("1", "true", "yes")
+    SQL_PROFILING_SLOW_QUERY_MS = float(
+        os.environ.get("SQL_PROFILING_SLOW_QUERY_MS", 100)
+    )
+    SQL_PROFILING_REPEAT_THRESHOLD = int(
+        os.environ.get("SQL_PROFILING_REPEAT_THRESHOLD", 5)
+    )
+    # Directory caching parsed ledger workbooks, disabled when unset
+    LEDGER_CACHE_DIR = os.environ.get("LEDGER_CACHE_DIR")
+    LEDGER_CACHE_MAX_MB = int(os.environ.get("LEDGER_CACHE_MAX_MB", 256))
 
 
 class DevelopmentConfig(Config):
@@ -29,3 +45,5 @@ class DevelopmentConfig(Config):
 class TestingConfig(Config):
     TESTING = True
     SQLALCHEMY_DATABASE_URI = os.environ.get("SQLALCHEMY_DATABASE_URI")
+    SQLALCHEMY_ASYNC_DATABASE_URI = None
+    LEDGER_CACHE_DIR = None
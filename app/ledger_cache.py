@@ -0,0 +1,269 @@
+"""
+On-disk cache of parsed ledger rows, keyed by file content and parser version.
+
+Rows are stored column by column in a compact binary file made of a type code
+per cell, a fixed 8-byte payload per cell (integer, float, timestamp or index
+in the string table) and a deduplicated UTF-8 string table. Cached files are
+memory-mapped when read, so a hit costs little more than reading the file.
+"""
+import contextlib
+import hashlib
+import mmap
+import os
+import struct
+import tempfile
+from datetime import date, datetime, time, timedelta
+
+from app.ledger_reader import PARSER_VERSION
+
+FORMAT_VERSION = 1
+MAGIC = b"LEDG"
+HEADER = struct.Struct("<4sIIIQ")
+CACHE_SUFFIX = ".ledger"
+
+NONE, STRING, INT, FLOAT, TRUE, FALSE, DATETIME, DATE, TIME, TIMEDELTA = range(10)
+EPOCH = datetime(1970, 1, 1)
+MICROSECOND = timedelta(microseconds=1)
+INT64_MIN, INT64_MAX = -(2**63), 2**63 - 1
+
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+def _time_to_microseconds(value: time) -> int:
+    return ((value.hour * 60 + value.minute) * 60 + value.second) * 1_000_000 + (
+        value.microsecond
+    )
+
+
+def _encode_cell(value, strings: dict) -> tuple[int, int | float]:
+    # bool is checked before int, which it subclasses, and datetime before date
+    if value is None:
+        return NONE, 0
+    if isinstance(value, str):
+        return STRING, strings.setdefault(value, len(strings))
+    if isinstance(value, bool):
+        return (TRUE if value else FALSE), 0
+    if isinstance(value, int):
+        if not INT64_MIN <= value <= INT64_MAX:
+            raise ValueError(f"Integer {value} does not fit in 64 bits")
+        return INT, value
+    if isinstance(value, float):
+        return FLOAT, value
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            raise ValueError("Timezone-aware datetimes are not cached")
+        return DATETIME, (value - EPOCH) // MICROSECOND
+    if isinstance(value, date):
+        return DATE, value.toordinal()
+    if isinstance(value, time):
+        if value.tzinfo is not None:
+            raise ValueError("Timezone-aware times are not cached")
+        return TIME, _time_to_microseconds(value)
+    if isinstance(value, timedelta):
+        return TIMEDELTA, value // MICROSECOND
+    raise ValueError(f"Cannot cache cell value of type {type(value).__name__}")
+
+
+def encode_rows(rows: list) -> bytes:
+    """
+    Serializes rows of equal width into the cache format.
+    """
+    row_count = len(rows)
+    width = max((len(row) for row in rows), default=0)
+    cell_count = row_count * width
+    types = bytearray(cell_count)
+    payload = bytearray(cell_count * 8)
+    strings = {}
+    index = 0
+    for column in range(width):
+        for row in rows:
+            value = row[column] if column < len(row) else None
+            type_code, data = _encode_cell(value, strings)
+            types[index] = type_code
+            if type_code == FLOAT:
+                struct.pack_into("<d", payload, index * 8, data)
+            elif data:
+                struct.pack_into("<q", payload, index * 8, data)
+            index += 1
+
+    encoded = [value.encode("utf-8") for value in strings]
+    offsets = [0]
+    for value in encoded:
+        offsets.append(offsets[-1] + len(value))
+
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, row_count, width, len(encoded))
+    parts = [header, bytes(_align(HEADER.size) - HEADER.size)]
+    parts += [types, bytes(_align(cell_count) - cell_count)]
+    parts += [payload, struct.pack(f"<{len(offsets)}q", *offsets), *encoded]
+    return b"".join(parts)
+
+
+def decode_rows(buffer) -> list[tuple]:
+    """
+    Rebuilds the rows stored in a buffer produced by ``encode_rows``.
+    """
+    with memoryview(buffer) as view:
+        if len(view) < HEADER.size:
+            raise ValueError("Ledger cache file is truncated")
+        magic, version, row_count, width, string_count = HEADER.unpack_from(view)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError("Not a ledger cache file of a supported version")
+        cell_count = row_count * width
+        types_start = _align(HEADER.size)
+        payload_start = types_start + _align(cell_count)
+        offsets_start = payload_start + cell_count * 8
+        blob_start = offsets_start + (string_count + 1) * 8
+        if len(view) < blob_start:
+            raise ValueError("Ledger cache file is truncated")
+
+        sections = []
+
+        def section(start: int, end: int, item_format: str = "B") -> memoryview:
+            part = view[start:end]
+            sections.append(part)
+            if item_format != "B":
+                part = part.cast(item_format)
+                sections.append(part)
+            return part
+
+        try:
+            types = section(types_start, types_start + cell_count)
+            integers = section(payload_start, offsets_start, "q")
+            floats = section(payload_start, offsets_start, "d")
+            offsets = section(offsets_start, blob_start, "q")
+            blob = section(blob_start, len(view))
+            strings = [
+                str(blob[offsets[i] : offsets[i + 1]], "utf-8")
+                for i in range(string_count)
+            ]
+            return _decode_columns(types, integers, floats, strings, row_count, width)
+        finally:
+            # Views left over would keep a memory-mapped file from closing
+            for part in reversed(sections):
+                part.release()
+
+
+def _decode_columns(types, integers, floats, strings, row_count, width):
+    decoders = {
+        STRING: lambda i: strings[integers[i]],
+        INT: lambda i: integers[i],
+        FLOAT: lambda i: floats[i],
+        TRUE: lambda i: True,
+        FALSE: lambda i: False,
+        DATETIME: lambda i: EPOCH + integers[i] * MICROSECOND,
+        DATE: lambda i: date.fromordinal(integers[i]),
+        TIME: lambda i: (datetime.min + integers[i] * MICROSECOND).time(),
+        TIMEDELTA: lambda i: integers[i] * MICROSECOND,
+    }
+    columns = []
+    for column in range(width):
+        start = column * row_count
+        columns.append(
+            [
+                None if type_code == NONE else decoders[type_code](start + offset)
+                for offset, type_code in enumerate(types[start : start + row_count])
+            ]
+        )
+    if not width:
+        return [() for _ in range(row_count)]
+    return list(zip(*columns))
+
+
+def file_digest(filename) -> str:
+    digest = hashlib.sha256()
+    with open(filename, "rb") as source:
+        for chunk in iter(lambda: source.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class LedgerCache:
+    """
+    Directory of cached ledger rows, evicting the least recently used files
+    once it grows past ``max_bytes``.
+
+    Entries are looked up by the key of a workbook, computed once per load
+    since it hashes the whole file.
+    """
+
+    def __init__(self, directory, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def key(self, filename) -> str | None:
+        """
+        Computes the cache key of a workbook from its content and the parser
+        and format versions.
+
+        Returns:
+            The key, or None when the file cannot be read.
+        """
+        try:
+            digest = file_digest(filename)
+        except OSError:
+            return None
+        return f"{digest}-p{PARSER_VERSION}-f{FORMAT_VERSION}"
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, key + CACHE_SUFFIX)
+
+    def get(self, key: str) -> list[tuple] | None:
+        path = self.path(key)
+        try:
+            with open(path, "rb") as cached:
+                with mmap.mmap(cached.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                    rows = decode_rows(data)
+            # Refresh the modification time used as the recency for eviction
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        return rows
+
+    def put(self, key: str, rows: list) -> bool:
+        """
+        Stores the rows parsed from a workbook, unless they hold values the
+        cache format cannot represent or the cache directory is not writable.
+
+        Returns:
+            Whether the rows were cached.
+        """
+        try:
+            data = encode_rows(rows)
+        except ValueError as exc:
+            print(f"Not caching ledger rows: {exc}")
+            return False
+        temporary = None
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            handle, temporary = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(handle, "wb") as output:
+                output.write(data)
+            os.replace(temporary, self.path(key))
+            temporary = None
+            self.evict()
+        except OSError as exc:
+            # The cache is optional, so a read-only or full disk must not
+            # fail the load
+            print(f"Not caching ledger rows: {exc}")
+            return False
+        finally:
+            if temporary is not None:
+                with contextlib.suppress(OSError):
+                    os.remove(temporary)
+        return True
+
+    def evict(self):
+        entries = []
+        with os.scandir(self.directory) as scan:
+            for entry in scan:
+                if entry.name.endswith(CACHE_SUFFIX):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            os.remove(path)
+            total -= size
@@ -0,0 +1,278 @@
+"""
+Streaming reader for ledger workbooks (``data.xlsx`` layout).
+
+The worksheet XML is parsed straight out of the zip archive and each row is
+turned into a plain tuple, skipping the cell objects and styling openpyxl
+builds. Values are converted exactly like ``openpyxl.load_workbook`` does so
+that the rows match ``load_workbook_data``.
+"""
+import posixpath
+import zipfile
+from functools import lru_cache
+from xml.etree.ElementTree import iterparse
+
+from openpyxl.styles.numbers import (
+    BUILTIN_FORMATS,
+    is_date_format,
+    is_timedelta_format,
+)
+from openpyxl.utils import column_index_from_string
+from openpyxl.utils.datetime import (
+    CALENDAR_MAC_1904,
+    WINDOWS_EPOCH,
+    from_excel,
+    from_ISO8601,
+)
+
+MAIN_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+REL_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+PKG_REL_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+SHEET_DATA_TAG = f"{MAIN_NS}sheetData"
+ROW_TAG = f"{MAIN_NS}row"
+VALUE_TAG = f"{MAIN_NS}v"
+FORMULA_TAG = f"{MAIN_NS}f"
+INLINE_STRING_TAG = f"{MAIN_NS}is"
+TEXT_TAG = f"{MAIN_NS}t"
+RUN_TAG = f"{MAIN_NS}r"
+DIGITS = "0123456789"
+# Bump whenever the rows produced for a given file change, to invalidate caches
+PARSER_VERSION = 1
+
+
+class LedgerFormatError(ValueError):
+    """
+    Raised when a workbook uses features the ledger reader does not handle.
+    """
+
+
+@lru_cache(maxsize=None)
+def column_index(letters: str) -> int:
+    return column_index_from_string(letters)
+
+
+def _text_content(element) -> str:
+    """
+    Joins the plain and rich text runs of a string item, ignoring phonetics.
+    """
+    snippets = []
+    for child in element:
+        if child.tag == TEXT_TAG:
+            snippets.append(child.text or "")
+        elif child.tag == RUN_TAG:
+            snippets.append(child.findtext(TEXT_TAG) or "")
+    return "".join(snippets)
+
+
+def _read_relationships(archive: zipfile.ZipFile, path: str) -> dict:
+    folder, name = posixpath.split(path)
+    rels_path = posixpath.join(folder, "_rels", f"{name}.rels")
+    if rels_path not in archive.namelist():
+        return {}
+    relationships = {}
+    with archive.open(rels_path) as source:
+        for _, element in iterparse(source):
+            if element.tag == f"{PKG_REL_NS}Relationship":
+                target = element.get("Target")
+                if target.startswith("/"):
+                    target = target[1:]
+                else:
+                    target = posixpath.normpath(posixpath.join(folder, target))
+                relationships[element.get("Id")] = (element.get("Type"), target)
+    return relationships
+
+
+def _find_target(relationships: dict, type_suffix: str) -> str | None:
+    for rel_type, target in relationships.values():
+        if rel_type.endswith(type_suffix):
+            return target
+    return None
+
+
+def read_shared_strings(archive: zipfile.ZipFile, path: str | None) -> tuple:
+    if path is None:
+        return ()
+    strings = []
+    with archive.open(path) as source:
+        for _, element in iterparse(source):
+            if element.tag == f"{MAIN_NS}si":
+                strings.append(_text_content(element).replace("x005F_", ""))
+                element.clear()
+    return tuple(strings)
+
+
+def read_date_styles(archive: zipfile.ZipFile, path: str | None) -> tuple[set, set]:
+    """
+    Finds the cell style indexes whose number format is a date or a duration.
+    """
+    if path is None:
+        return set(), set()
+    custom_formats = {}
+    number_format_ids = []
+    with archive.open(path) as source:
+        for _, element in iterparse(source):
+            if element.tag == f"{MAIN_NS}numFmt":
+                custom_formats[int(element.get("numFmtId"))] = element.get(
+                    "formatCode"
+                )
+            elif element.tag == f"{MAIN_NS}cellXfs":
+                number_format_ids = [
+                    int(xf.get("numFmtId", 0)) for xf in element.iter(f"{MAIN_NS}xf")
+                ]
+    date_styles, timedelta_styles = set(), set()
+    for index, format_id in enumerate(number_format_ids):
+        code = custom_formats.get(format_id, BUILTIN_FORMATS.get(format_id))
+        if is_date_format(code):
+            date_styles.add(index)
+        if is_timedelta_format(code):
+            timedelta_styles.add(index)
+    return date_styles, timedelta_styles
+
+
+class LedgerSheet:
+    """
+    A worksheet of a workbook with the lookups needed to decode it.
+    """
+
+    def __init__(self, archive: zipfile.ZipFile, sheet_index: int = 0):
+        self.archive = archive
+        package_rels = _read_relationships(archive, "")
+        workbook_path = (
+            _find_target(package_rels, "/officeDocument") or "xl/workbook.xml"
+        )
+        workbook_rels = _read_relationships(archive, workbook_path)
+
+        sheet_paths = []
+        self.epoch = WINDOWS_EPOCH
+        with archive.open(workbook_path) as source:
+            for _, element in iterparse(source):
+                if element.tag == f"{MAIN_NS}workbookPr":
+                    if element.get("date1904") in ("1", "true"):
+                        self.epoch = CALENDAR_MAC_1904
+                elif element.tag == f"{MAIN_NS}sheet":
+                    rel_type, target = workbook_rels[element.get(f"{REL_NS}id")]
+                    if rel_type.endswith("/worksheet"):
+                        sheet_paths.append(target)
+        self.path = sheet_paths[sheet_index]
+        self.shared_strings = read_shared_strings(
+            archive, _find_target(workbook_rels, "/sharedStrings")
+        )
+        self.date_styles, self.timedelta_styles = read_date_styles(
+            archive, _find_target(workbook_rels, "/styles")
+        )
+
+    def cell_value(self, cell):
+        data_type = cell.get("t", "n")
+        formula = cell.find(FORMULA_TAG)
+        if formula is not None:
+            if formula.get("t") is not None:
+                raise LedgerFormatError(
+                    f"Unsupported {formula.get('t')} formula in cell {cell.get('r')}"
+                )
+            return "=" + (formula.text or "")
+        if data_type == "inlineStr":
+            child = cell.find(INLINE_STRING_TAG)
+            return _text_content(child) if child is not None else None
+
+        value = cell.findtext(VALUE_TAG) or None
+        if value is None:
+            return None
+        if data_type == "n":
+            if "." in value or "E" in value or "e" in value:
+                value = float(value)
+            else:
+                value = int(value)
+            style = int(cell.get("s", 0))
+            if style in self.date_styles:
+                try:
+                    return from_excel(
+                        value, self.epoch, timedelta=style in self.timedelta_styles
+                    )
+                except (OverflowError, ValueError):
+                    return "#VALUE!"
+            return value
+        if data_type == "s":
+            return self.shared_strings[int(value)]
+        if data_type == "b":
+            return bool(int(value))
+        if data_type == "d":
+            return from_ISO8601(value)
+        return value
+
+    def iter_rows(self):
+        """
+        Yields ``(row_number, values)`` for every row holding at least one cell.
+        """
+        row_counter = 0
+        sheet_data = None
+        with self.archive.open(self.path) as source:
+            for event, element in iterparse(source, events=("start", "end")):
+                if event == "start":
+                    if element.tag == SHEET_DATA_TAG:
+                        sheet_data = element
+                    continue
+                if element.tag != ROW_TAG:
+                    continue
+                row_number = element.get("r")
+                row_counter = int(row_number) if row_number else row_counter + 1
+                values = []
+                for cell in element:
+                    coordinate = cell.get("r")
+                    if coordinate:
+                        column = column_index(coordinate.rstrip(DIGITS))
+                        if column > len(values) + 1:
+                            values.extend([None] * (column - len(values) - 1))
+                    values.append(self.cell_value(cell))
+                # Detach the parsed row too, or sheetData keeps one element
+                # per row and the tree grows with the sheet
+                element.clear()
+                if sheet_data is not None:
+                    sheet_data.clear()
+                if values:
+                    yield row_counter, tuple(values)
+
+
+def _fill_rows(rows, width: int):
+    """
+    Pads rows to ``width`` and inserts the empty rows missing from the sheet,
+    like openpyxl does.
+    """
+    empty_row = (None,) * width
+    next_row = 1
+    for row_number, values in rows:
+        for _ in range(next_row, row_number):
+            yield empty_row
+        next_row = row_number + 1
+        if len(values) < width:
+            values += (None,) * (width - len(values))
+        yield values
+
+
+def iter_ledger_rows(filename, width: int, sheet_index: int = 0):
+    """
+    Streams the rows of a ledger worksheet as tuples padded to ``width``.
+    """
+    with zipfile.ZipFile(filename) as archive:
+        sheet = LedgerSheet(archive, sheet_index)
+        yield from _fill_rows(sheet.iter_rows(), width)
+
+
+def read_ledger_rows(filename, sheet_index: int = 0) -> list[tuple]:
+    """
+    Reads every row of a ledger worksheet.
+
+    Args:
+        filename: Path to the ``.xlsx`` file.
+        sheet_index: Position of the worksheet in the workbook.
+
+    Returns:
+        One tuple per row from the first row to the last one holding a cell,
+        all padded to the widest row, matching ``load_workbook_data``.
+    """
+    with zipfile.ZipFile(filename) as archive:
+        sheet = LedgerSheet(archive, sheet_index)
+        rows = list(sheet.iter_rows())
+    if not rows:
+        return [(None,)]
+    width = max(len(values) for _, values in rows)
+    return list(_fill_rows(rows, width))
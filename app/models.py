@@ -1,14 +1,18 @@
 from datetime import datetime
 
 from sqlalchemy import (
+    DDL,
     Boolean,
     Column,
     Date,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     Numeric,
     String,
+    event,
+    func,
 )
 from sqlalchemy.orm import relationship
 
@@ -17,17 +21,27 @@ from app import sqlalchemy as db
 
 class Tenant(db.Model):
     __tablename__ = "tenants"
+    __table_args__ = (
+        # Trigram index for name word search, only created on PostgreSQL
+        Index(
+            "ix_tenants_tenant_name_trgm",
+            "tenant_name",
+            postgresql_using="gin",
+            postgresql_ops={"tenant_name": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+    )
     id = Column(Integer, primary_key=True)
     tenant_name = Column(String(255), nullable=False)
-    tenant_code = Column(String(255))
-    tenant_main_unit_no = Column(String(255))
-    tenant_property_name = Column(String(255))
+    tenant_code = Column(String(255), index=True)
+    tenant_main_unit_no = Column(String(255), index=True)
+    tenant_property_name = Column(String(255), index=True)
     tenant_general_contact = Column(String(255))
     tenant_telephone = Column(String(255))
     tenant_lease_start_date = Column(Date)
     tenant_lease_end_date = Column(Date)
     tenant_vacate_date = Column(Date)
     tenant_is_active = Column(Boolean, nullable=False, default=False)
+    tenant_lease_expired = Column(Boolean, nullable=False, default=False)
     transactions = relationship("TenantTransaction")
     created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
     updated_at = Column(
@@ -36,6 +50,16 @@ class Tenant(db.Model):
 
     @property
     def serialize(self):
+        return self.serialize_with_transactions(self.transactions)
+
+    def serialize_with_transactions(self, transactions):
+        return {
+            **self.serialize_summary,
+            "transactions": [txn.serialize for txn in transactions],
+        }
+
+    @property
+    def serialize_summary(self):
         return {
             "id": self.id,
             "tenant_name": self.tenant_name,
@@ -48,12 +72,73 @@ class Tenant(db.Model):
             "tenant_lease_end_date": self.tenant_lease_end_date,
             "tenant_vacate_date": self.tenant_vacate_date,
             "tenant_is_active": self.tenant_is_active,
+            "tenant_lease_expired": self.tenant_lease_expired,
             "created_at": self.created_at,
             "updated_at": self.updated_at,
-            "transactions": [txn.serialize for txn in self.transactions],
         }
 
 
+# Case-insensitive exact search on code, unit and property
+Index("ix_tenants_tenant_code_lower", func.lower(func.trim(Tenant.tenant_code)))
+Index(
+    "ix_tenants_tenant_main_unit_no_lower",
+    func.lower(func.trim(Tenant.tenant_main_unit_no)),
+)
+Index(
+    "ix_tenants_tenant_property_name_lower",
+    func.lower(func.trim(Tenant.tenant_property_name)),
+)
+
+# Full-text index for name prefix search on SQLite, kept in sync by triggers
+TENANT_NAME_FTS_TABLE = "tenants_fts"
+TENANT_NAME_FTS_DDL = tuple(
+    statement.format(table=TENANT_NAME_FTS_TABLE)
+    for statement in (
+        """
+        CREATE VIRTUAL TABLE IF NOT EXISTS {table} USING fts5(
+            tenant_name, content='tenants', content_rowid='id',
+            tokenize="unicode61 remove_diacritics 0 tokenchars '_'",
+            prefix='2 3 4'
+        )
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS {table}_insert AFTER INSERT ON tenants BEGIN
+            INSERT INTO {table} (rowid, tenant_name) VALUES (new.id, new.tenant_name);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS {table}_delete AFTER DELETE ON tenants BEGIN
+            INSERT INTO {table} ({table}, rowid, tenant_name)
+            VALUES ('delete', old.id, old.tenant_name);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS {table}_update
+        AFTER UPDATE OF tenant_name ON tenants BEGIN
+            INSERT INTO {table} ({table}, rowid, tenant_name)
+            VALUES ('delete', old.id, old.tenant_name);
+            INSERT INTO {table} (rowid, tenant_name) VALUES (new.id, new.tenant_name);
+        END
+        """,
+    )
+)
+for statement in TENANT_NAME_FTS_DDL:
+    event.listen(
+        Tenant.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite")
+    )
+event.listen(
+    Tenant.__table__,
+    "after_drop",
+    DDL(f"DROP TABLE IF EXISTS {TENANT_NAME_FTS_TABLE}").execute_if(dialect="sqlite"),
+)
+
+event.listen(
+    Tenant.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
+
+
 class TenantTransaction(db.Model):
     __tablename__ = "tenant_transactions"
     id = Column(Integer, primary_key=True)
@@ -65,7 +150,7 @@ class TenantTransaction(db.Model):
     exclusive = Column(Numeric(precision=10, scale=2))
     inclusive = Column(Numeric(precision=10, scale=2))
     description = Column(String(255))
-    tenant_id = Column(Integer, ForeignKey("tenants.id"))
+    tenant_id = Column(Integer, ForeignKey("tenants.id"), index=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -0,0 +1,215 @@
+"""
+Declarative range partitioning of tenant transactions by period on PostgreSQL.
+
+Periods are stored as ``YYYYMM`` strings, so a monthly partition covers
+``['202101', '202102')`` and a yearly one ``['2021', '2022')``. The
+granularity is recorded in the comment of the partitioned table, so that new
+partitions always get bounds matching the existing ones.
+"""
+import re
+
+import click
+from flask import current_app
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from app import sqlalchemy as db
+
+TABLE_NAME = "tenant_transactions"
+GRANULARITIES = ("monthly", "yearly")
+GRANULARITY_COMMENT = "Partitioned by period, {granularity}"
+PARTITION_NAME_PATTERN = re.compile(rf"{TABLE_NAME}_p\d+")
+
+
+def partition_bounds(period, granularity: str) -> tuple[str, str]:
+    """
+    Computes the range of periods covered by the partition holding a period.
+
+    Args:
+        period: The ``YYYYMM`` period of a transaction.
+        granularity: Either ``monthly`` or ``yearly``.
+
+    Returns:
+        The inclusive lower and exclusive upper bounds of the partition.
+    """
+    period = str(int(period))
+    year, month = int(period[:4]), int(period[4:6])
+    if granularity == "monthly":
+        next_year, next_month = (year + 1, 1) if month == 12 else (year, month + 1)
+        return f"{year}{month:02d}", f"{next_year}{next_month:02d}"
+    if granularity == "yearly":
+        return f"{year}", f"{year + 1}"
+    raise ValueError(
+        f"Unknown partition granularity '{granularity}', expected one of {GRANULARITIES}"
+    )
+
+
+def partition_name(period, granularity: str) -> str:
+    lower, _ = partition_bounds(period, granularity)
+    return f"{TABLE_NAME}_p{lower}"
+
+
+def is_partitioned(connection: Connection) -> bool:
+    if connection.dialect.name != "postgresql":
+        return False
+    result = connection.execute(
+        text(
+            "SELECT 1 FROM pg_partitioned_table pt "
+            "JOIN pg_class c ON c.oid = pt.partrelid "
+            "WHERE c.relname = :name AND pg_table_is_visible(c.oid)"
+        ),
+        {"name": TABLE_NAME},
+    )
+    return result.first() is not None
+
+
+def partition_granularity(connection: Connection) -> str | None:
+    """
+    Reads the granularity tenant transactions were partitioned with.
+
+    Returns:
+        ``monthly`` or ``yearly``, or None when the table is not partitioned.
+
+    Raises:
+        ValueError: If the table is partitioned without a recorded granularity.
+    """
+    if not is_partitioned(connection):
+        return None
+    comment = connection.execute(
+        text("SELECT obj_description(CAST(:name AS regclass), 'pg_class')"),
+        {"name": TABLE_NAME},
+    ).scalar()
+    for granularity in GRANULARITIES:
+        if comment == GRANULARITY_COMMENT.format(granularity=granularity):
+            return granularity
+    raise ValueError(
+        f"{TABLE_NAME} is partitioned but its granularity is not recorded; "
+        "recreate the partitions with flask partition-transactions"
+    )
+
+
+def ensure_partition(connection: Connection, period, granularity: str) -> str:
+    """
+    Creates the partition holding a period if it does not exist yet.
+
+    Returns:
+        The name of the partition.
+    """
+    lower, upper = partition_bounds(period, granularity)
+    name = partition_name(period, granularity)
+    connection.execute(
+        text(
+            f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {TABLE_NAME} "
+            f"FOR VALUES FROM ('{lower}') TO ('{upper}')"
+        )
+    )
+    return name
+
+
+def ensure_partitions(connection: Connection, periods, granularity: str) -> set[str]:
+    return {ensure_partition(connection, period, granularity) for period in periods}
+
+
+def drop_partition(connection: Connection, period, granularity: str) -> str:
+    """
+    Drops every transaction of a period's partition by dropping the partition
+    itself, which only touches the catalog instead of deleting row by row.
+
+    Returns:
+        The name of the dropped partition.
+    """
+    name = partition_name(period, granularity)
+    connection.execute(text(f"ALTER TABLE {TABLE_NAME} DETACH PARTITION {name}"))
+    connection.execute(text(f"DROP TABLE {name}"))
+    return name
+
+
+def partition_table(connection: Connection, granularity: str):
+    """
+    Converts the plain tenant transactions table into a table partitioned by
+    period, creating one partition per existing period and moving the rows.
+    """
+    old_name = f"{TABLE_NAME}_unpartitioned"
+    periods = connection.execute(
+        text(f"SELECT DISTINCT period FROM {TABLE_NAME}")
+    ).scalars().all()
+    statements = [
+        f"ALTER TABLE {TABLE_NAME} RENAME TO {old_name}",
+        f"ALTER INDEX {TABLE_NAME}_pkey RENAME TO {old_name}_pkey",
+        f"ALTER INDEX IF EXISTS ix_{TABLE_NAME}_tenant_id "
+        f"RENAME TO ix_{old_name}_tenant_id",
+        f"ALTER SEQUENCE {TABLE_NAME}_id_seq OWNED BY NONE",
+        # The partition key has to be part of the primary key
+        f"CREATE TABLE {TABLE_NAME} ("
+        f"LIKE {old_name} INCLUDING DEFAULTS, "
+        f"PRIMARY KEY (id, period), "
+        f"FOREIGN KEY (tenant_id) REFERENCES tenants (id)"
+        f") PARTITION BY RANGE (period)",
+        f"CREATE INDEX ix_{TABLE_NAME}_tenant_id ON {TABLE_NAME} (tenant_id)",
+    ]
+    for statement in statements:
+        connection.execute(text(statement))
+    comment = GRANULARITY_COMMENT.format(granularity=granularity)
+    connection.execute(text(f"COMMENT ON TABLE {TABLE_NAME} IS '{comment}'"))
+    ensure_partitions(connection, periods, granularity)
+    connection.execute(text(f"INSERT INTO {TABLE_NAME} SELECT * FROM {old_name}"))
+    connection.execute(text(f"DROP TABLE {old_name}"))
+    connection.execute(
+        text(f"ALTER SEQUENCE {TABLE_NAME}_id_seq OWNED BY {TABLE_NAME}.id")
+    )
+
+
+def unpartition_table(connection: Connection):
+    """
+    Converts the partitioned tenant transactions table back into a plain table.
+    """
+    old_name = f"{TABLE_NAME}_partitioned"
+    statements = [
+        f"ALTER TABLE {TABLE_NAME} RENAME TO {old_name}",
+        f"ALTER INDEX {TABLE_NAME}_pkey RENAME TO {old_name}_pkey",
+        f"ALTER INDEX IF EXISTS ix_{TABLE_NAME}_tenant_id "
+        f"RENAME TO ix_{old_name}_tenant_id",
+        f"ALTER SEQUENCE {TABLE_NAME}_id_seq OWNED BY NONE",
+        f"CREATE TABLE {TABLE_NAME} ("
+        f"LIKE {old_name} INCLUDING DEFAULTS, "
+        f"PRIMARY KEY (id), "
+        f"FOREIGN KEY (tenant_id) REFERENCES tenants (id))",
+        f"CREATE INDEX ix_{TABLE_NAME}_tenant_id ON {TABLE_NAME} (tenant_id)",
+        f"INSERT INTO {TABLE_NAME} SELECT * FROM {old_name}",
+        f"DROP TABLE {old_name}",
+        f"ALTER SEQUENCE {TABLE_NAME}_id_seq OWNED BY {TABLE_NAME}.id",
+    ]
+    for statement in statements:
+        connection.execute(text(statement))
+
+
+@click.command("partition-transactions")
+@click.option(
+    "--granularity",
+    type=click.Choice(GRANULARITIES),
+    help="Defaults to TRANSACTION_PARTITIONING.",
+)
+@click.option("--revert", is_flag=True, help="Convert back to a plain table.")
+def partition_transactions_command(granularity, revert):
+    """
+    Partition tenant_transactions by period on PostgreSQL, or revert it.
+    """
+    granularity = granularity or current_app.config.get("TRANSACTION_PARTITIONING")
+    with db.engine.begin() as connection:
+        if connection.dialect.name != "postgresql":
+            raise click.ClickException("Partitioning requires PostgreSQL")
+        partitioned = is_partitioned(connection)
+        if revert:
+            if partitioned:
+                unpartition_table(connection)
+                click.echo(f"Converted {TABLE_NAME} back to a plain table")
+            else:
+                click.echo(f"{TABLE_NAME} is not partitioned")
+            return
+        if partitioned:
+            click.echo(f"{TABLE_NAME} is already partitioned")
+            return
+        if granularity is None:
+            raise click.UsageError("Pass --granularity or set TRANSACTION_PARTITIONING")
+        partition_table(connection, granularity)
+    click.echo(f"Partitioned {TABLE_NAME} {granularity}")
@@ -0,0 +1,111 @@
+"""
+Opt-in per-request SQL profiling.
+
+Counts the statements run by each request and the time spent in the
+database through engine events, warns about statements repeated many times
+(N+1 patterns) and slow queries, and reports the timings in a
+``Server-Timing`` response header.
+"""
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+
+from flask import Flask, g, has_request_context
+from flask.json.provider import DefaultJSONProvider
+from sqlalchemy import event
+
+
+@dataclass
+class RequestProfile:
+    start: float = field(default_factory=time.perf_counter)
+    query_count: int = 0
+    db_time: float = 0.0
+    serialize_time: float = 0.0
+    statements: Counter = field(default_factory=Counter)
+
+
+def current_profile() -> RequestProfile | None:
+    if not has_request_context():
+        return None
+    return g.get("sql_profile")
+
+
+class ProfilingJSONProvider(DefaultJSONProvider):
+    """
+    JSON provider adding the time spent encoding responses to the profile.
+    """
+
+    def dumps(self, obj, **kwargs) -> str:
+        start = time.perf_counter()
+        try:
+            return super().dumps(obj, **kwargs)
+        finally:
+            profile = current_profile()
+            if profile is not None:
+                profile.serialize_time += time.perf_counter() - start
+
+
+def server_timing_header(profile: RequestProfile, total: float) -> str:
+    return ", ".join(
+        [
+            f'db;dur={profile.db_time * 1000:.2f};desc="{profile.query_count} queries"',
+            f"serialize;dur={profile.serialize_time * 1000:.2f}",
+            f"total;dur={total * 1000:.2f}",
+        ]
+    )
+
+
+def init_profiling(app: Flask, engine):
+    """
+    Registers the engine events and request hooks profiling each request.
+
+    Args:
+        app: The Flask application instance.
+        engine: The SQLAlchemy engine used by the application.
+    """
+    slow_query_seconds = app.config["SQL_PROFILING_SLOW_QUERY_MS"] / 1000
+    repeat_threshold = app.config["SQL_PROFILING_REPEAT_THRESHOLD"]
+    app.json = ProfilingJSONProvider(app)
+
+    # The start time is kept on the execution context of the statement, which
+    # is discarded with it even when the statement raises
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, many):
+        context._profiling_start_time = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, many):
+        duration = time.perf_counter() - context._profiling_start_time
+        profile = current_profile()
+        if profile is None:
+            return
+        profile.query_count += 1
+        profile.db_time += duration
+        profile.statements[statement] += 1
+        if duration >= slow_query_seconds:
+            app.logger.warning(
+                "Slow query (%.1f ms): %s with parameters %r",
+                duration * 1000,
+                statement,
+                parameters,
+            )
+
+    @app.before_request
+    def start_profile():
+        g.sql_profile = RequestProfile()
+
+    @app.after_request
+    def finish_profile(response):
+        profile = current_profile()
+        if profile is None:
+            return response
+        total = time.perf_counter() - profile.start
+        for statement, count in profile.statements.items():
+            if count > repeat_threshold:
+                app.logger.warning(
+                    "Possible N+1 query, statement executed %d times: %s",
+                    count,
+                    statement,
+                )
+        response.headers["Server-Timing"] = server_timing_header(profile, total)
+        return response
@@ -11,3 +11,13 @@ class AbstractRepository(abc.ABC):
     @abc.abstractmethod
     def get(self, reference) -> db.Model:
         raise NotImplementedError
+
+
+class AbstractAsyncRepository(abc.ABC):
+    @abc.abstractmethod
+    async def add(self, item: db.Model):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def get(self, reference) -> db.Model:
+        raise NotImplementedError
@@ -1,19 +1,32 @@
+from collections import defaultdict
+
+from sqlalchemy import or_, select
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
 
-from app.models import Tenant
-from app.repository.base import AbstractRepository
+from app.models import Tenant, TenantTransaction
+from app.repository.base import AbstractAsyncRepository, AbstractRepository
+from app.search import search_statement
 
 
 class TenantRepository(AbstractRepository):
     def __init__(self, session: Session):
         self.session = session
 
-    def get(self, id) -> Tenant | None:
+    def get(self, id, period=None) -> Tenant | None:
         item = self.session.query(Tenant).filter_by(id=id).first()
         if not item:
             return None
-        return item.serialize
+        if period is None:
+            return item.serialize
+        # Filtering on period lets PostgreSQL prune the other partitions
+        transactions = (
+            self.session.query(TenantTransaction)
+            .filter_by(tenant_id=id, period=period)
+            .all()
+        )
+        return item.serialize_with_transactions(transactions)
 
     def add(self, tenant: Tenant):
         try:
@@ -22,3 +35,136 @@ class TenantRepository(AbstractRepository):
         except SQLAlchemyError as err:
             print(err)
             raise err
+
+    def get_many(self, ids=(), codes=(), period=None) -> list[dict]:
+        """
+        Fetches several tenants with their transactions in two queries.
+
+        Args:
+            ids: Primary keys of the tenants.
+            codes: Tenant codes of the tenants.
+            period: Optional period restricting the transactions.
+
+        Returns:
+            The serialized tenants ordered by id.
+        """
+        conditions = []
+        if ids:
+            conditions.append(Tenant.id.in_(ids))
+        if codes:
+            conditions.append(Tenant.tenant_code.in_(codes))
+        if not conditions:
+            return []
+        tenants = self.session.scalars(
+            select(Tenant).where(or_(*conditions)).order_by(Tenant.id)
+        ).all()
+        if not tenants:
+            return []
+
+        stmt = (
+            select(TenantTransaction)
+            .where(TenantTransaction.tenant_id.in_([tenant.id for tenant in tenants]))
+            .order_by(TenantTransaction.tenant_id, TenantTransaction.id)
+        )
+        if period is not None:
+            stmt = stmt.where(TenantTransaction.period == period)
+        transactions = defaultdict(list)
+        for transaction in self.session.scalars(stmt):
+            transactions[transaction.tenant_id].append(transaction)
+        return [
+            tenant.serialize_with_transactions(transactions[tenant.id])
+            for tenant in tenants
+        ]
+
+    def search(self, name=None, limit=50, **exact) -> list[dict]:
+        """
+        Searches tenants by name word prefixes and exact code, unit or property,
+        all case-insensitive.
+
+        Names are matched through the trigram index on PostgreSQL and the
+        ``tenants_fts`` full-text table on SQLite.
+
+        Args:
+            name: Prefixes of words of the tenant name, all of which must match.
+            limit: The maximum number of tenants returned.
+            **exact: Exact values for ``code``, ``unit`` or ``property``.
+
+        Returns:
+            The serialized tenants ordered by id, without their transactions.
+        """
+        stmt = search_statement(self.session.get_bind().dialect.name, name, **exact)
+        if stmt is None:
+            return []
+        stmt = stmt.limit(limit)
+        return [item.serialize_summary for item in self.session.scalars(stmt)]
+
+
+class AsyncTenantRepository(AbstractAsyncRepository):
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get(self, id, period=None) -> Tenant | None:
+        stmt = select(Tenant).filter_by(id=id)
+        if period is None:
+            # Lazy loading is not available on an AsyncSession, so the
+            # transactions used by ``serialize`` are loaded eagerly.
+            stmt = stmt.options(selectinload(Tenant.transactions))
+        item = (await self.session.execute(stmt)).scalars().first()
+        if not item:
+            return None
+        if period is None:
+            return item.serialize
+        stmt = select(TenantTransaction).filter_by(tenant_id=id, period=period)
+        transactions = (await self.session.execute(stmt)).scalars().all()
+        return item.serialize_with_transactions(transactions)
+
+    async def get_many(self, ids=(), codes=(), period=None) -> list[dict]:
+        """
+        Fetches several tenants the same way as ``TenantRepository.get_many``.
+        """
+        conditions = []
+        if ids:
+            conditions.append(Tenant.id.in_(ids))
+        if codes:
+            conditions.append(Tenant.tenant_code.in_(codes))
+        if not conditions:
+            return []
+        stmt = select(Tenant).where(or_(*conditions)).order_by(Tenant.id)
+        tenants = (await self.session.execute(stmt)).scalars().all()
+        if not tenants:
+            return []
+
+        stmt = (
+            select(TenantTransaction)
+            .where(TenantTransaction.tenant_id.in_([tenant.id for tenant in tenants]))
+            .order_by(TenantTransaction.tenant_id, TenantTransaction.id)
+        )
+        if period is not None:
+            stmt = stmt.where(TenantTransaction.period == period)
+        transactions = defaultdict(list)
+        for transaction in (await self.session.execute(stmt)).scalars():
+            transactions[transaction.tenant_id].append(transaction)
+        return [
+            tenant.serialize_with_transactions(transactions[tenant.id])
+            for tenant in tenants
+        ]
+
+    async def search(self, name=None, limit=50, **exact) -> list[dict]:
+        """
+        Searches tenants the same way as ``TenantRepository.search``.
+        """
+        dialect_name = self.session.get_bind().dialect.name
+        stmt = search_statement(dialect_name, name, **exact)
+        if stmt is None:
+            return []
+        stmt = stmt.limit(limit)
+        items = (await self.session.execute(stmt)).scalars()
+        return [item.serialize_summary for item in items]
+
+    async def add(self, tenant: Tenant):
+        try:
+            self.session.add(tenant)
+            await self.session.flush()
+        except SQLAlchemyError as err:
+            print(err)
+            raise err
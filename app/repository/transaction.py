@@ -1,8 +1,10 @@
+from sqlalchemy import select
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.models import TenantTransaction
-from app.repository.base import AbstractRepository
+from app.repository.base import AbstractAsyncRepository, AbstractRepository
 
 
 class TenantTransactionRepository(AbstractRepository):
@@ -34,3 +36,34 @@ class TenantTransactionRepository(AbstractRepository):
             print(err)
             raise err
         return tenant_transactions
+
+
+class AsyncTenantTransactionRepository(AbstractAsyncRepository):
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get(self, id) -> TenantTransaction | None:
+        try:
+            stmt = select(TenantTransaction).filter_by(id=id)
+            tenant_transaction = (await self.session.execute(stmt)).scalars().first()
+        except SQLAlchemyError as err:
+            print(err)
+            raise err
+        return tenant_transaction
+
+    async def add(self, tenant_transaction: TenantTransaction) -> TenantTransaction:
+        try:
+            self.session.add(tenant_transaction)
+        except SQLAlchemyError as err:
+            print(err)
+            raise err
+        return tenant_transaction
+
+    async def bulk_add(self, tenant_transactions: list[TenantTransaction]):
+        try:
+            self.session.add_all(tenant_transactions)
+            await self.session.flush()
+        except SQLAlchemyError as err:
+            print(err)
+            raise err
+        return tenant_transactions
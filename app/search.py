@@ -0,0 +1,81 @@
+"""
+Tenant search conditions shared by every database: the name matches when each
+query word starts a word of the name, and code, unit and property match
+exactly, all ignoring case.
+
+PostgreSQL matches names through its trigram index and SQLite through the
+``tenants_fts`` full-text table, while both match the exact fields through
+indexes on their lowercased values.
+"""
+import re
+
+from sqlalchemy import Integer, Select, column, func, select, table
+
+from app.models import TENANT_NAME_FTS_TABLE, Tenant
+
+WORD_PATTERN = re.compile(r"\w+")
+EXACT_FIELDS = {
+    "code": Tenant.tenant_code,
+    "unit": Tenant.tenant_main_unit_no,
+    "property": Tenant.tenant_property_name,
+}
+TENANT_NAME_FTS = table(
+    TENANT_NAME_FTS_TABLE, column("rowid", Integer), column(TENANT_NAME_FTS_TABLE)
+)
+
+
+def normalize(value) -> str:
+    return str(value).strip().lower()
+
+
+def name_words(value) -> list[str]:
+    return sorted(set(WORD_PATTERN.findall(normalize(value or ""))))
+
+
+def fts_prefix_query(words: list[str]) -> str:
+    """
+    Builds an FTS5 query matching names with a word starting with each word.
+    """
+    return " ".join('"{}"*'.format(word.replace('"', '""')) for word in words)
+
+
+def search_statement(dialect_name: str, name=None, **exact) -> Select | None:
+    """
+    Builds the query selecting the tenants matching a search, ordered by id.
+
+    Args:
+        dialect_name: Name of the database dialect, ``postgresql`` or ``sqlite``.
+        name: Prefixes of words of the tenant name, all of which must match.
+        **exact: Exact values for ``code``, ``unit`` or ``property``, ignored
+        when empty.
+
+    Returns:
+        The query, or None when the name holds no word so nothing matches.
+    """
+    stmt = select(Tenant).where(
+        *[
+            func.lower(func.trim(EXACT_FIELDS[field])) == normalize(value)
+            for field, value in exact.items()
+            if value
+        ]
+    )
+    if not name:
+        return stmt.order_by(Tenant.id)
+    words = name_words(name)
+    if not words:
+        return None
+    if dialect_name == "postgresql":
+        # \m anchors each word at the start of a word of the name
+        return stmt.where(
+            *[
+                Tenant.tenant_name.regexp_match(rf"\m{re.escape(word)}", flags="i")
+                for word in words
+            ]
+        ).order_by(Tenant.id)
+    # Following the full-text matches in rowid order lets a limited query stop
+    # at the first matches instead of collecting all of them
+    return (
+        stmt.join(TENANT_NAME_FTS, TENANT_NAME_FTS.c.rowid == Tenant.id)
+        .where(TENANT_NAME_FTS.c[TENANT_NAME_FTS_TABLE].match(fts_prefix_query(words)))
+        .order_by(TENANT_NAME_FTS.c.rowid)
+    )
@@ -0,0 +1,122 @@
+"""
+Set-based recomputation of the tenant active status and lease expiry flags.
+
+Both flags depend on dates, so they go stale as time passes even when no new
+ledger is loaded. They are recomputed by ``UPDATE`` statements over ranges of
+tenant ids, each committed on its own so that locks are only held briefly,
+and only the rows whose flags change are written.
+"""
+from datetime import date, datetime
+
+import click
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.engine import Engine
+
+from app import sqlalchemy as db
+from app.models import Tenant
+
+DEFAULT_BATCH_SIZE = 10_000
+
+
+def active_condition(today: date):
+    """
+    A tenant stays active until their vacate date, if any.
+    """
+    return or_(Tenant.tenant_vacate_date.is_(None), Tenant.tenant_vacate_date > today)
+
+
+def lease_expired_condition(today: date):
+    return and_(
+        Tenant.tenant_lease_end_date.is_not(None),
+        Tenant.tenant_lease_end_date < today,
+    )
+
+
+def _as_date(value) -> date | None:
+    # openpyxl reads date cells as datetimes
+    if isinstance(value, datetime):
+        return value.date()
+    return value if isinstance(value, date) else None
+
+
+def tenant_flags(lease_end_date, vacate_date, today: date | None = None):
+    """
+    Computes ``tenant_is_active`` and ``tenant_lease_expired`` for a single
+    tenant, with the same rules as ``active_condition`` and
+    ``lease_expired_condition``.
+
+    Returns:
+        The active and lease expired flags.
+    """
+    today = today or date.today()
+    lease_end_date, vacate_date = _as_date(lease_end_date), _as_date(vacate_date)
+    is_active = vacate_date is None or vacate_date > today
+    lease_expired = lease_end_date is not None and lease_end_date < today
+    return is_active, lease_expired
+
+
+def recompute_tenant_statuses(
+    engine: Engine, today: date | None = None, batch_size: int = DEFAULT_BATCH_SIZE
+) -> int:
+    """
+    Recomputes ``tenant_is_active`` and ``tenant_lease_expired`` for every
+    tenant.
+
+    Args:
+        engine: The engine of the database holding the tenants.
+        today: The date the flags are computed for, today by default.
+        batch_size: Width of the range of tenant ids updated per transaction.
+
+    Returns:
+        The number of tenants whose flags changed.
+    """
+    today = today or date.today()
+    with engine.connect() as connection:
+        first_id, last_id = connection.execute(
+            select(func.min(Tenant.id), func.max(Tenant.id))
+        ).one()
+    if first_id is None:
+        return 0
+
+    active = active_condition(today)
+    lease_expired = lease_expired_condition(today)
+    updated = 0
+    for start in range(first_id, last_id + 1, batch_size):
+        statement = (
+            update(Tenant)
+            .where(
+                Tenant.id >= start,
+                Tenant.id < start + batch_size,
+                or_(
+                    Tenant.tenant_is_active.is_distinct_from(active),
+                    Tenant.tenant_lease_expired.is_distinct_from(lease_expired),
+                ),
+            )
+            .values(tenant_is_active=active, tenant_lease_expired=lease_expired)
+        )
+        with engine.begin() as connection:
+            updated += connection.execute(statement).rowcount
+    return updated
+
+
+@click.command("refresh-tenant-status")
+@click.option(
+    "--today",
+    type=click.DateTime(formats=["%Y-%m-%d"]),
+    help="Compute the flags for this date instead of today.",
+)
+@click.option(
+    "--batch-size",
+    type=click.IntRange(min=1),
+    default=DEFAULT_BATCH_SIZE,
+    show_default=True,
+)
+def refresh_tenant_status_command(today, batch_size):
+    """
+    Recompute the active status and lease expiry of every tenant.
+    """
+    updated = recompute_tenant_statuses(
+        db.engine, today=today.date() if today else None, batch_size=batch_size
+    )
+    click.echo(f"Updated {updated} tenants")
+
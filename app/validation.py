@@ -0,0 +1,94 @@
+"""
+Validation of API request parameters, shared by the Flask and ASGI apps so
+that both accept and reject the same requests.
+"""
+MAX_BATCH_SIZE = 1000
+SEARCH_FIELDS = ("name", "code", "unit", "property")
+DEFAULT_SEARCH_LIMIT = 50
+MAX_SEARCH_LIMIT = 500
+
+
+def parse_search_request(args) -> tuple[dict, int]:
+    """
+    Validates the query parameters of a tenant search.
+
+    Args:
+        args: The query parameters, as a mapping of names to strings.
+
+    Returns:
+        The search filters and the number of tenants to return, clamped
+        between 1 and ``MAX_SEARCH_LIMIT``.
+
+    Raises:
+        ValueError: If no filter is given, with a message for the client.
+    """
+    filters = {}
+    for field in SEARCH_FIELDS:
+        value = args.get(field)
+        # Blank parameters such as ``code=`` are left out rather than matched
+        filters[field] = value if value and value.strip() else None
+    if not any(filters.values()):
+        raise ValueError("Provide at least one of name, code, unit or property")
+    try:
+        limit = int(args.get("limit", DEFAULT_SEARCH_LIMIT))
+    except ValueError:
+        limit = DEFAULT_SEARCH_LIMIT
+    return filters, max(1, min(limit, MAX_SEARCH_LIMIT))
+
+
+def _is_int(value) -> bool:
+    # bool is a subclass of int but true is neither an id nor a code
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _is_str_or_int(value) -> bool:
+    return isinstance(value, str) or _is_int(value)
+
+
+def parse_batch_request(payload) -> tuple[list[int], list[str], str | None]:
+    """
+    Validates the JSON body of a batch transactions request.
+
+    Args:
+        payload: The decoded JSON body, None when it is missing or invalid.
+
+    Returns:
+        The tenant ids, tenant codes and optional period to fetch.
+
+    Raises:
+        ValueError: If the body is malformed, with a message for the client.
+    """
+    if not isinstance(payload, dict):
+        raise ValueError("The body must be a JSON object")
+    ids = payload.get("ids") or []
+    codes = payload.get("codes") or []
+    period = payload.get("period")
+    if not isinstance(ids, list) or not all(_is_int(tenant_id) for tenant_id in ids):
+        raise ValueError("ids must be a list of integers")
+    if not isinstance(codes, list) or not all(_is_str_or_int(code) for code in codes):
+        raise ValueError("codes must be a list of strings")
+    if period is not None:
+        if not _is_str_or_int(period):
+            raise ValueError("period must be a string such as 202101")
+        period = str(period)
+    if not ids and not codes:
+        raise ValueError("Provide at least one tenant id or code")
+    if len(ids) + len(codes) > MAX_BATCH_SIZE:
+        raise ValueError(f"At most {MAX_BATCH_SIZE} tenants per request")
+    return ids, [str(code) for code in codes], period
+
+
+def batch_response(ids: list[int], codes: list[str], tenants: list[dict]) -> dict:
+    """
+    Builds the body of a batch transactions response, listing the requested
+    ids and codes that matched no tenant.
+    """
+    found_ids = {tenant["id"] for tenant in tenants}
+    found_codes = {tenant["tenant_code"] for tenant in tenants}
+    return {
+        "tenants": tenants,
+        "missing": {
+            "ids": [tenant_id for tenant_id in ids if tenant_id not in found_ids],
+            "codes": [code for code in codes if code not in found_codes],
+        },
+    }
@@ -0,0 +1,80 @@
+"""
+Shared helpers to start the API servers and time HTTP requests.
+"""
+import os
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+SERVERS = {
+    "flask": [sys.executable, "-m", "flask", "run", "--port", "{port}"],
+    "asgi": [
+        sys.executable,
+        "-m",
+        "uvicorn",
+        "--factory",
+        "app.asgi:create_asgi_app",
+        "--port",
+        "{port}",
+        "--log-level",
+        "warning",
+    ],
+}
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def start_server(name: str, port: int, env: dict | None = None) -> subprocess.Popen:
+    command = [part.format(port=port) for part in SERVERS[name]]
+    return subprocess.Popen(
+        command,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        env={**os.environ, **(env or {})},
+    )
+
+
+def stop_server(process: subprocess.Popen):
+    process.terminate()
+    process.wait()
+
+
+def wait_until_ready(url: str, timeout: float = 15.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            urllib.request.urlopen(url, timeout=1).read()
+            return
+        except urllib.error.HTTPError:
+            return
+        except (urllib.error.URLError, ConnectionError):
+            time.sleep(0.2)
+    raise RuntimeError(f"Server at {url} did not start in {timeout}s")
+
+
+def timed_get(url: str) -> float:
+    start = time.perf_counter()
+    urllib.request.urlopen(url, timeout=120).read()
+    return time.perf_counter() - start
+
+
+def timed_request(url: str) -> tuple[float, int]:
+    """
+    Times a GET request, returning its latency in seconds and its status code.
+    """
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(url, timeout=120) as response:
+            response.read()
+            status = response.status
+    except urllib.error.HTTPError as err:
+        status = err.code
+    except (urllib.error.URLError, ConnectionError):
+        status = 0
+    return time.perf_counter() - start, status
@@ -0,0 +1,59 @@
+"""
+Compares the wall time of the sequential and pipelined ledger loaders.
+
+Each loader writes into a freshly created database, by default a SQLite file
+in the instance folder. The pipeline only pays off when the writers wait on
+the database, as with PostgreSQL over the network; with SQLite both stages
+compete for the same CPU.
+
+    python -m benchmarks.ingest data/data.xlsx --writers 1
+"""
+import argparse
+import time
+
+from app import create_app
+from app import sqlalchemy as db
+from app.config import Config
+from app.ledger_reader import read_ledger_rows
+from main import load_data_to_db, load_data_to_db_pipelined, positive_int
+
+
+def timed(function, *args, **kwargs) -> float:
+    start = time.perf_counter()
+    function(*args, **kwargs)
+    return time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("filename", nargs="?", default="data/data.xlsx")
+    parser.add_argument("--database", default="sqlite:///ingest_benchmark.db")
+    parser.add_argument("--writers", type=positive_int, default=1)
+    args = parser.parse_args(argv)
+
+    class IngestConfig(Config):
+        SQLALCHEMY_DATABASE_URI = args.database
+
+    app = create_app(IngestConfig())
+    with app.app_context():
+        parse = timed(read_ledger_rows, args.filename)
+
+        db.drop_all()
+        db.create_all()
+        sequential = timed(load_data_to_db, args.filename)
+        db.session.remove()
+
+        db.drop_all()
+        db.create_all()
+        pipelined = timed(
+            load_data_to_db_pipelined, args.filename, writers=args.writers
+        )
+        db.drop_all()
+
+    print(f"parse only  {parse:7.2f} s")
+    print(f"sequential  {sequential:7.2f} s")
+    print(f"pipelined   {pipelined:7.2f} s   ({args.writers} writer(s))")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Compares the parse time of openpyxl and the streaming ledger reader, and the
+time to read the same rows back from the ledger cache.
+
+    python -m benchmarks.ledger_reader data/data.xlsx --repeat 5
+"""
+import argparse
+import statistics
+import tempfile
+import time
+
+from app.ledger_cache import LedgerCache
+from app.ledger_reader import read_ledger_rows
+from main import load_workbook_data
+
+
+def time_reader(reader, filename: str, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        reader(filename)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("filename", nargs="?", default="data/data.xlsx")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    baseline = time_reader(load_workbook_data, args.filename, args.repeat)
+    streaming = time_reader(read_ledger_rows, args.filename, args.repeat)
+    with tempfile.TemporaryDirectory() as directory:
+        cache = LedgerCache(directory, 1 << 30)
+        cache.put(cache.key(args.filename), read_ledger_rows(args.filename))
+        # A hit includes hashing the workbook to find its entry
+        cached = time_reader(
+            lambda filename: cache.get(cache.key(filename)), args.filename, args.repeat
+        )
+    print(f"openpyxl   {baseline * 1000:9.1f} ms")
+    print(f"streaming  {streaming * 1000:9.1f} ms   ({baseline / streaming:.1f}x faster)")
+    print(f"cache hit  {cached * 1000:9.1f} ms   ({baseline / cached:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,283 @@
+"""
+Load tests the API against a locally seeded database.
+
+Synthetic tenants with small, medium and large ledgers are written to a local
+database, the API is started against it and a deterministic mix of requests
+is sent by concurrent clients. Throughput and p50/p95/p99 latency are printed
+and can be saved as JSON, tagged with the current commit, to compare runs.
+
+    python -m benchmarks.loadtest --tenants 200 --concurrency 50 --requests 2000 \\
+        --mix transactions=8,period=1,search=1 --output loadtest.json
+
+Pass ``--baseline`` with the JSON of an earlier run to print the relative
+change of throughput and latency.
+"""
+import argparse
+import json
+import random
+import subprocess
+import sys
+import time
+import urllib.parse
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+
+from sqlalchemy import insert
+
+from app import create_app
+from app import sqlalchemy as db
+from app.config import Config
+from app.models import Tenant, TenantTransaction
+from benchmarks.helpers import (
+    SERVERS,
+    percentile,
+    start_server,
+    stop_server,
+    timed_request,
+    wait_until_ready,
+)
+
+DEFAULT_DATABASE = "sqlite:///loadtest.db"
+DEFAULT_MIX = "transactions=8,period=1,search=1"
+# Number of transactions per tenant and the share of tenants having that many
+LEDGER_SIZES = {10: 0.6, 200: 0.3, 2000: 0.1}
+PERIODS = [
+    f"{year}{month:02d}" for year in (2021, 2022, 2023) for month in range(1, 13)
+]
+NAMES = ["Lindiwe", "Thabo", "Sipho", "Naledi", "Ayanda", "Pieter", "Anele", "Zanele"]
+DESCRIPTIONS = ["Water", "Heat Pump Recovery", "Electricity", "Rent", "Refuse"]
+
+
+def parse_mix(mix: str) -> dict[str, int]:
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        if name not in ENDPOINTS:
+            raise ValueError(
+                f"Unknown endpoint '{name}', expected one of {list(ENDPOINTS)}"
+            )
+        weights[name] = int(weight or 1)
+    return weights
+
+
+def seed_database(tenant_count: int, seed: int) -> list[int]:
+    """
+    Recreates the tables and fills them with synthetic tenants.
+
+    Returns:
+        The ledger size of every tenant, in tenant id order.
+    """
+    rng = random.Random(seed)
+    db.drop_all()
+    db.create_all()
+    sizes = rng.choices(
+        list(LEDGER_SIZES), weights=list(LEDGER_SIZES.values()), k=tenant_count
+    )
+    tenants = [
+        {
+            "id": tenant_id,
+            "tenant_name": f"{rng.choice(NAMES)} Tenant {tenant_id}",
+            "tenant_code": f"L{tenant_id}",
+            "tenant_main_unit_no": str(rng.randint(1, 999)),
+            "tenant_property_name": "Load Test Tower",
+            "tenant_lease_start_date": date(2021, 1, 1),
+            "tenant_is_active": True,
+        }
+        for tenant_id in range(1, tenant_count + 1)
+    ]
+    db.session.execute(insert(Tenant), tenants)
+
+    now = datetime.utcnow()
+    batch = []
+    for tenant_id, size in enumerate(sizes, start=1):
+        for i in range(size):
+            amount = round(rng.uniform(10, 500), 2)
+            batch.append(
+                {
+                    "period": PERIODS[i % len(PERIODS)],
+                    "date": date(2021, 1, 1),
+                    "transaction": "i030",
+                    "description": rng.choice(DESCRIPTIONS),
+                    "tax": 0,
+                    "exclusive": amount,
+                    "inclusive": amount,
+                    "tenant_id": tenant_id,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+            )
+        if len(batch) >= 10_000:
+            db.session.execute(insert(TenantTransaction), batch)
+            batch = []
+    if batch:
+        db.session.execute(insert(TenantTransaction), batch)
+    db.session.commit()
+    return sizes
+
+
+def transactions_url(rng: random.Random, tenant_count: int) -> str:
+    return f"/api/v1/tenants/{rng.randint(1, tenant_count)}/transactions"
+
+
+def period_url(rng: random.Random, tenant_count: int) -> str:
+    return f"{transactions_url(rng, tenant_count)}?period={rng.choice(PERIODS)}"
+
+
+def search_url(rng: random.Random, tenant_count: int) -> str:
+    if rng.random() < 0.5:
+        query = {"code": f"L{rng.randint(1, tenant_count)}"}
+    else:
+        query = {"name": rng.choice(NAMES)[:4]}
+    return f"/api/v1/tenants/search?{urllib.parse.urlencode(query)}"
+
+
+ENDPOINTS = {
+    "transactions": transactions_url,
+    "period": period_url,
+    "search": search_url,
+}
+
+
+def build_plan(mix: dict[str, int], requests: int, tenant_count: int, seed: int):
+    rng = random.Random(seed)
+    names = rng.choices(list(mix), weights=list(mix.values()), k=requests)
+    return [(name, ENDPOINTS[name](rng, tenant_count)) for name in names]
+
+
+def summarize(samples: list[tuple[float, int]], elapsed: float) -> dict:
+    latencies = [latency for latency, _ in samples]
+    return {
+        "requests": len(samples),
+        "errors": sum(1 for _, status in samples if status != 200),
+        "rps": len(samples) / elapsed,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+    }
+
+
+def run_plan(base_url: str, plan: list, concurrency: int) -> dict:
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        samples = list(pool.map(timed_request, [base_url + url for _, url in plan]))
+    elapsed = time.perf_counter() - start
+
+    by_endpoint = defaultdict(list)
+    for (name, _), sample in zip(plan, samples):
+        by_endpoint[name].append(sample)
+    results = {name: summarize(group, elapsed) for name, group in by_endpoint.items()}
+    results["total"] = summarize(samples, elapsed)
+    return results
+
+
+def current_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_results(results: dict):
+    print(
+        f"{'endpoint':<13} {'req':>6} {'err':>5} {'req/s':>8} "
+        f"{'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}"
+    )
+    for name, result in results.items():
+        print(
+            f"{name:<13} {result['requests']:>6} {result['errors']:>5} "
+            f"{result['rps']:>8.1f} {result['p50_ms']:>9.1f} "
+            f"{result['p95_ms']:>9.1f} {result['p99_ms']:>9.1f}"
+        )
+
+
+def print_comparison(results: dict, baseline: dict):
+    print(f"\nCompared to {baseline.get('commit')} ({baseline.get('timestamp')})")
+    print(f"{'endpoint':<13} {'req/s':>9} {'p50':>9} {'p95':>9} {'p99':>9}")
+    for name, result in results.items():
+        previous = baseline["results"].get(name)
+        if previous is None:
+            continue
+        changes = [
+            (result[key] - previous[key]) / previous[key] * 100 if previous[key] else 0
+            for key in ("rps", "p50_ms", "p95_ms", "p99_ms")
+        ]
+        print(f"{name:<13} " + " ".join(f"{change:>+8.1f}%" for change in changes))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database", default=DEFAULT_DATABASE)
+    parser.add_argument("--server", choices=list(SERVERS), default="flask")
+    parser.add_argument("--tenants", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--mix", default=DEFAULT_MIX)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--port", type=int, default=5200)
+    parser.add_argument("--no-seed", action="store_true", help="reuse the database")
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="allow seeding to recreate the tables of a database other than the default",
+    )
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="JSON results of a previous run to compare")
+    args = parser.parse_args(argv)
+    mix = parse_mix(args.mix)
+    if not args.no_seed and args.database != DEFAULT_DATABASE and not args.force:
+        parser.error(
+            "seeding drops every table of --database; pass --force to allow it "
+            "or --no-seed to reuse the existing data"
+        )
+
+    class LoadTestConfig(Config):
+        SQLALCHEMY_DATABASE_URI = args.database
+
+    if not args.no_seed:
+        app = create_app(LoadTestConfig())
+        with app.app_context():
+            sizes = seed_database(args.tenants, args.seed)
+        print(f"Seeded {args.tenants} tenants with {sum(sizes)} transactions")
+
+    plan = build_plan(mix, args.warmup + args.requests, args.tenants, args.seed)
+    process = start_server(args.server, args.port, env={"DATABASE_URL": args.database})
+    base_url = f"http://127.0.0.1:{args.port}"
+    try:
+        wait_until_ready(base_url + plan[0][1])
+        run_plan(base_url, plan[: args.warmup], args.concurrency)
+        results = run_plan(base_url, plan[args.warmup :], args.concurrency)
+    finally:
+        stop_server(process)
+
+    print_results(results)
+    if args.baseline:
+        with open(args.baseline) as baseline:
+            print_comparison(results, json.load(baseline))
+    if args.output:
+        report = {
+            "commit": current_commit(),
+            "timestamp": datetime.utcnow().isoformat(),
+            "parameters": {
+                key: value
+                for key, value in vars(args).items()
+                if key not in ("output", "baseline")
+            },
+            "results": results,
+        }
+        with open(args.output, "w") as output:
+            json.dump(report, output, indent=2)
+    # Failed requests are usually much faster, so the figures would be misleading
+    errors = results["total"]["errors"]
+    if errors:
+        sys.exit(f"{errors} requests did not return 200")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Times tenant search lookups against a local scratch database.
+
+``--seed`` recreates the tables and fills them with synthetic tenants, while
+without it the tenants already in the database are searched.
+
+    python -m benchmarks.search --seed 300000 --lookups 200
+"""
+import argparse
+import random
+import time
+
+from sqlalchemy import insert
+
+from app import create_app
+from app import sqlalchemy as db
+from app.config import Config
+from app.models import Tenant
+from app.repository.tenants import TenantRepository
+from benchmarks.helpers import percentile
+
+DEFAULT_DATABASE = "sqlite:///search_benchmark.db"
+
+FIRST_NAMES = ["Lindiwe", "Thabo", "Sipho", "Naledi", "Ayanda", "Pieter", "Anele", "Zanele"]
+LAST_NAMES = ["Mweli", "Dube", "Nkosi", "Van Wyk", "Mokoena", "Botha", "Khumalo", "Ndlovu"]
+PROPERTIES = ["The Museum Tower", "Harbour View", "Canal Walk", "Bay Court", "Sea Point"]
+
+
+def seed_tenants(count: int, batch_size: int = 10_000):
+    rng = random.Random(42)
+    db.drop_all()
+    db.create_all()
+    for start in range(0, count, batch_size):
+        rows = [
+            {
+                "tenant_name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {i}",
+                "tenant_code": f"B{i}",
+                "tenant_main_unit_no": str(rng.randint(1, 999)),
+                "tenant_property_name": rng.choice(PROPERTIES),
+                "tenant_is_active": True,
+            }
+            for i in range(start, min(start + batch_size, count))
+        ]
+        db.session.execute(insert(Tenant), rows)
+        db.session.commit()
+
+
+def time_lookups(label: str, lookups: list[dict]):
+    tenant_repo = TenantRepository(db.session)
+    tenant_repo.search(**lookups[0])
+    timings = []
+    for lookup in lookups:
+        start = time.perf_counter()
+        tenant_repo.search(**lookup)
+        timings.append((time.perf_counter() - start) * 1000)
+    print(
+        f"{label:<8} p50 {percentile(timings, 50):8.2f} ms   "
+        f"p99 {percentile(timings, 99):8.2f} ms"
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database", default=DEFAULT_DATABASE)
+    parser.add_argument("--seed", type=int, default=0, help="synthetic tenants to insert")
+    parser.add_argument("--lookups", type=int, default=200)
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="allow seeding to recreate the tables of a database other than the default",
+    )
+    args = parser.parse_args(argv)
+    if args.seed and args.database != DEFAULT_DATABASE and not args.force:
+        parser.error(
+            "seeding drops every table of --database; pass --force to allow it "
+            "or leave out --seed to search the existing data"
+        )
+
+    class BenchmarkConfig(Config):
+        SQLALCHEMY_DATABASE_URI = args.database
+
+    app = create_app(BenchmarkConfig())
+    with app.app_context():
+        if args.seed:
+            seed_tenants(args.seed)
+        else:
+            db.create_all()
+        total = db.session.query(Tenant).count()
+        print(f"{total} tenants")
+        rng = random.Random(7)
+        time_lookups(
+            "name",
+            [{"name": rng.choice(FIRST_NAMES)[:4]} for _ in range(args.lookups)],
+        )
+        time_lookups(
+            "2 words",
+            [
+                {"name": f"{rng.choice(FIRST_NAMES)[:3]} {rng.choice(LAST_NAMES)[:3]}"}
+                for _ in range(args.lookups)
+            ],
+        )
+        time_lookups(
+            "code",
+            [{"code": f"B{rng.randrange(max(total, 1))}"} for _ in range(args.lookups)],
+        )
+        time_lookups(
+            "property",
+            [{"property": rng.choice(PROPERTIES)} for _ in range(args.lookups)],
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Compares request latency of the Flask (WSGI) and async (ASGI) serving modes.
+
+Both servers are started against the database configured in ``.env`` and hit
+with the same number of concurrent requests for the given tenants.
+
+    python -m benchmarks.serving --tenant-id 1 --tenant-id 2 --concurrency 50
+"""
+import argparse
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.helpers import (
+    SERVERS,
+    percentile,
+    start_server,
+    stop_server,
+    timed_get,
+    wait_until_ready,
+)
+
+
+def run_load(base_url: str, tenant_ids: list[int], requests: int, concurrency: int):
+    urls = [
+        f"{base_url}/api/v1/tenants/{tenant_ids[i % len(tenant_ids)]}/transactions"
+        for i in range(requests)
+    ]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        latencies = list(pool.map(timed_get, urls))
+    elapsed = time.perf_counter() - start
+    return {
+        "requests": requests,
+        "rps": requests / elapsed,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "mean_ms": statistics.fmean(latencies) * 1000,
+    }
+
+
+def benchmark_server(name: str, port: int, args) -> dict:
+    process = start_server(name, port)
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        wait_until_ready(f"{base_url}/api/v1/tenants/{args.tenant_id[0]}/transactions")
+        return run_load(base_url, args.tenant_id, args.requests, args.concurrency)
+    finally:
+        stop_server(process)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tenant-id", type=int, action="append", required=True)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--port", type=int, default=5100)
+    args = parser.parse_args(argv)
+
+    print(f"{'mode':<6} {'req':>6} {'req/s':>9} {'p50 ms':>9} {'p99 ms':>9}")
+    for offset, name in enumerate(SERVERS):
+        result = benchmark_server(name, args.port + offset, args)
+        print(
+            f"{name:<6} {result['requests']:>6} {result['rps']:>9.1f} "
+            f"{result['p50_ms']:>9.1f} {result['p99_ms']:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
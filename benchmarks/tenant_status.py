@@ -0,0 +1,134 @@
+"""
+Times the bulk recomputation of tenant active status and lease expiry.
+
+Synthetic tenants with random lease end and vacate dates and stale flags are
+written to a local database, then recomputed with set-based updates. Pass
+``--orm`` to also time loading and saving every tenant through the ORM.
+
+    python -m benchmarks.tenant_status --tenants 300000 --orm
+"""
+import argparse
+import random
+import time
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import insert, update
+
+from app import create_app
+from app import sqlalchemy as db
+from app.config import Config
+from app.models import Tenant
+from app.tenant_status import DEFAULT_BATCH_SIZE, recompute_tenant_statuses
+
+TODAY = date(2024, 6, 15)
+
+
+def seed_tenants(tenant_count: int, seed: int):
+    rng = random.Random(seed)
+    db.drop_all()
+    db.create_all()
+    now = datetime.utcnow()
+    for start in range(1, tenant_count + 1, 50_000):
+        tenants = []
+        for tenant_id in range(start, min(start + 50_000, tenant_count + 1)):
+            lease_end = TODAY + timedelta(days=rng.randint(-1500, 1500))
+            vacate = lease_end if rng.random() < 0.2 else None
+            tenants.append(
+                {
+                    "id": tenant_id,
+                    "tenant_name": f"Tenant {tenant_id}",
+                    "tenant_code": f"S{tenant_id}",
+                    "tenant_lease_end_date": lease_end,
+                    "tenant_vacate_date": vacate,
+                    "tenant_is_active": vacate is None,
+                    "tenant_lease_expired": False,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+            )
+        db.session.execute(insert(Tenant), tenants)
+    db.session.commit()
+
+
+def reset_flags():
+    """
+    Restores the flags set when seeding, as computed at ingest time.
+    """
+    db.session.execute(
+        update(Tenant).values(
+            tenant_is_active=Tenant.tenant_vacate_date.is_(None),
+            tenant_lease_expired=False,
+        )
+    )
+    db.session.commit()
+
+
+def recompute_with_orm(today: date) -> int:
+    """
+    Recomputes the flags one tenant object at a time, as a baseline.
+    """
+    updated = 0
+    for tenant in db.session.query(Tenant):
+        vacate_date = tenant.tenant_vacate_date
+        is_active = vacate_date is None or vacate_date > today
+        lease_expired = (
+            tenant.tenant_lease_end_date is not None
+            and tenant.tenant_lease_end_date < today
+        )
+        if (tenant.tenant_is_active, tenant.tenant_lease_expired) != (
+            is_active,
+            lease_expired,
+        ):
+            tenant.tenant_is_active = is_active
+            tenant.tenant_lease_expired = lease_expired
+            updated += 1
+    db.session.commit()
+    return updated
+
+
+def timed(function, *args, **kwargs) -> tuple[float, int]:
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database", default="sqlite:///tenant_status.db")
+    parser.add_argument("--tenants", type=int, default=300_000)
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--orm", action="store_true", help="also time the ORM loop")
+    args = parser.parse_args(argv)
+
+    class BenchmarkConfig(Config):
+        SQLALCHEMY_DATABASE_URI = args.database
+
+    app = create_app(BenchmarkConfig())
+    with app.app_context():
+        seed_tenants(args.tenants, args.seed)
+        print(f"Seeded {args.tenants} tenants")
+
+        elapsed, updated = timed(
+            recompute_tenant_statuses,
+            db.engine,
+            today=TODAY,
+            batch_size=args.batch_size,
+        )
+        print(f"set-based   {elapsed:8.2f} s   {updated} tenants updated")
+        elapsed, updated = timed(
+            recompute_tenant_statuses,
+            db.engine,
+            today=TODAY,
+            batch_size=args.batch_size,
+        )
+        print(f"no changes  {elapsed:8.2f} s   {updated} tenants updated")
+
+        if args.orm:
+            reset_flags()
+            elapsed, updated = timed(recompute_with_orm, TODAY)
+            print(f"ORM loop    {elapsed:8.2f} s   {updated} tenants updated")
+
+
+if __name__ == "__main__":
+    main()
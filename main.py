@@ -1,12 +1,22 @@
+import argparse
+import queue
+import threading
+import zipfile
+
+from flask import current_app
 from openpyxl import load_workbook
 from openpyxl.utils.exceptions import InvalidFileException
 from sqlalchemy.orm import Session
 
 from app import create_app
 from app import sqlalchemy as db
+from app.ledger_cache import LedgerCache
+from app.ledger_reader import LedgerFormatError, iter_ledger_rows, read_ledger_rows
 from app.models import Tenant, TenantTransaction
+from app.partitions import ensure_partitions, partition_granularity
 from app.repository.tenants import TenantRepository
 from app.repository.transaction import TenantTransactionRepository
+from app.tenant_status import recompute_tenant_statuses, tenant_flags
 
 
 def load_workbook_data(filename):
@@ -25,6 +35,69 @@ def load_workbook_data(filename):
         return None
 
 
+def get_ledger_cache() -> LedgerCache | None:
+    directory = current_app.config.get("LEDGER_CACHE_DIR")
+    if not directory:
+        return None
+    return LedgerCache(directory, current_app.config["LEDGER_CACHE_MAX_MB"] << 20)
+
+
+LEDGER_READER_ERRORS = (
+    LedgerFormatError,
+    KeyError,
+    IndexError,
+    OSError,
+    zipfile.BadZipFile,
+)
+
+
+def load_ledger_data(filename, cache: LedgerCache | None = None):
+    """
+    Reads the ledger rows with the streaming reader, falling back to openpyxl
+    for workbooks using features it does not handle.
+
+    Args:
+        filename: Path to the ledger workbook.
+        cache: Cache returning the rows of a workbook parsed before and
+        storing the rows of a new one.
+    """
+    key = cache.key(filename) if cache is not None else None
+    if key is not None:
+        rows = cache.get(key)
+        if rows is not None:
+            return rows
+    try:
+        rows = read_ledger_rows(filename)
+    except LEDGER_READER_ERRORS as exc:
+        print(f"Falling back to openpyxl for {filename}: {exc}")
+        rows = load_workbook_data(filename)
+    if key is not None and rows is not None:
+        cache.put(key, rows)
+    return rows
+
+
+def stream_ledger_rows(filename, width: int):
+    """
+    Streams the ledger rows with the streaming reader, switching to openpyxl
+    from the row reached if it meets a feature it does not handle.
+
+    openpyxl reads the whole workbook, so memory is only bounded when the
+    streaming reader handles it.
+    """
+    streamed = 0
+    try:
+        for row in iter_ledger_rows(filename, width=width):
+            yield row
+            streamed += 1
+    except LEDGER_READER_ERRORS as exc:
+        print(f"Falling back to openpyxl for {filename}: {exc}")
+        rows = load_workbook_data(filename)
+        if rows is None:
+            raise
+        for row in rows[streamed:]:
+            yield tuple(row) + (None,) * (width - len(row))
+
+
 def convert_tenant_row_to_dict(row):
     result = {}
     for i in range(0, len(row), 2):
@@ -37,7 +110,9 @@ def convert_tenant_row_to_dict(row):
 def prepare_tenant_item(row: list):
     tenant_info = convert_tenant_row_to_dict(row)
     vacate_date = tenant_info.get("Vacate")
-    tenant_is_active = True if not vacate_date else False
+    tenant_is_active, tenant_lease_expired = tenant_flags(
+        tenant_info["Ends"], vacate_date
+    )
     tenant_info["tenant_is_active"] = tenant_is_active
     tenant_model = {
         "tenant_name": tenant_info["Tenant"],
@@ -50,6 +125,7 @@ def prepare_tenant_item(row: list):
         "tenant_lease_end_date": tenant_info["Ends"],
         "tenant_vacate_date": vacate_date,
         "tenant_is_active": tenant_is_active,
+        "tenant_lease_expired": tenant_lease_expired,
     }
     tenant = Tenant(**tenant_model)
     return tenant
@@ -90,6 +166,33 @@ def process_transaction(
     transaction_repo.add(tenant_transaction)
 
 
+def build_transaction(row, period, tenant_id: int) -> TenantTransaction | None:
+    """
+    Builds the transaction of a ledger row, skipping rows without an amount.
+    """
+    date = row[1]
+    transaction = row[2]
+    description = row[3]
+    tax = float(row[4]) if row[4] else 0
+    remarks = row[5]
+    exclusive = float(row[6]) if row[6] else 0
+    inclusive = row[8]
+    if not inclusive or inclusive == "0.00":
+        return None
+
+    return TenantTransaction(
+        period=int(period),
+        date=date,
+        transaction=transaction,
+        tax=tax,
+        remarks=remarks,
+        exclusive=exclusive,
+        inclusive=inclusive,
+        description=description,
+        tenant_id=tenant_id,
+    )
+
+
 def save_tenant_data(
     tenant_transaction_repo: TenantTransactionRepository,
     prepared_tenant_data: dict,
@@ -105,16 +208,30 @@ def save_tenant_data(
             raise exc
 
 
+def ensure_period_partitions(db: Session, periods: set):
+    """
+    Creates the missing transaction partitions for the given periods when
+    tenant_transactions is partitioned, with the granularity recorded on it.
+    """
+    if not periods:
+        return
+    connection = db.connection()
+    granularity = partition_granularity(connection)
+    if granularity is not None:
+        ensure_partitions(connection, periods, granularity)
+
+
 # write function to read csv file from directory and loop through the rows
-def load_data_to_db():
+def load_data_to_db(filename="data/data.xlsx"):
     tenant_repo = TenantRepository(db.session)
     transaction_repo = TenantTransactionRepository(db.session)
-    row_list = load_workbook_data(filename="data/data.xlsx")
+    row_list = load_ledger_data(filename=filename, cache=get_ledger_cache())
     checked_tenant_ids = []
     current_tenant_id = None
     # I assume the first cell of period column will always be filled with a value
     last_inserted_period = None
     prepared_data = {}
+    periods = set()
     for row in row_list:
         if row[0] == "Tenant":
             tenant = prepare_tenant_item(row)
@@ -126,38 +243,193 @@ def load_data_to_db():
         elif current_tenant_id in checked_tenant_ids:
             # What happens if period is not filled in the first transaction row?
             period = row[0]
-            date = row[1]
-            transaction = row[2]
-            description = row[3]
-            tax = float(row[4]) if row[4] else 0
-            remarks = row[5]
-            exclusive = float(row[6]) if row[6] else 0
-            inclusive = row[8]
             if not period:
                 period = last_inserted_period
             last_inserted_period = period
 
-            if not inclusive or inclusive == "0.00":
+            tenant_transaction = build_transaction(row, period, current_tenant_id)
+            if tenant_transaction is None:
                 continue
-
-            tenant_transaction = TenantTransaction(
-                period=int(period),
-                date=date,
-                transaction=transaction,
-                tax=tax,
-                remarks=remarks,
-                exclusive=exclusive,
-                inclusive=inclusive,
-                description=description,
-                tenant_id=current_tenant_id
-            )
             prepared_data[current_tenant_id]["transactions"].append(tenant_transaction)
+            periods.add(tenant_transaction.period)
         else:
             continue
+    ensure_period_partitions(db.session, periods)
     save_tenant_data(transaction_repo, prepared_data, db.session)
+    recompute_tenant_statuses(db.engine)
+
+
+# Transaction rows only use the first 9 columns of the ledger
+LEDGER_WIDTH = 9
+
+
+def iter_tenant_blocks(rows):
+    """
+    Groups ledger rows into ``(tenant_row, transaction_rows)`` blocks.
+
+    The period of transaction rows leaving it empty is filled in from the
+    previous row, so that blocks can be written independently.
+    """
+    tenant_row = None
+    transaction_rows = []
+    last_inserted_period = None
+    for row in rows:
+        if row[0] == "Tenant":
+            if tenant_row is not None:
+                yield tenant_row, transaction_rows
+            tenant_row, transaction_rows = row, []
+        elif tenant_row is not None:
+            period = row[0]
+            if not period:
+                period = last_inserted_period
+            last_inserted_period = period
+            transaction_rows.append((period, row))
+    if tenant_row is not None:
+        yield tenant_row, transaction_rows
+
+
+class PeriodPartitions:
+    """
+    Creates the partitions of new periods once, for concurrent writers.
+    """
+
+    def __init__(self, engine, granularity: str | None):
+        self.engine = engine
+        self.granularity = granularity
+        self.created = set()
+        self.lock = threading.Lock()
+
+    def ensure(self, periods: set):
+        if not self.granularity or periods <= self.created:
+            return
+        with self.lock:
+            missing = periods - self.created
+            if missing:
+                with self.engine.begin() as connection:
+                    ensure_partitions(connection, missing, self.granularity)
+                self.created |= missing
+
+
+def write_tenant_blocks(
+    engine,
+    blocks: queue.Queue,
+    partitions: PeriodPartitions,
+    failure: threading.Event,
+    errors: list,
+):
+    """
+    Writer stage: saves tenant blocks from the queue on its own connection
+    until it receives ``None``.
+    """
+    with Session(engine) as session:
+        tenant_repo = TenantRepository(session)
+        transaction_repo = TenantTransactionRepository(session)
+        while True:
+            block = blocks.get()
+            if block is None:
+                return
+            if failure.is_set():
+                # Keep draining so that the parser is never blocked
+                continue
+            tenant_row, transaction_rows = block
+            try:
+                tenant = prepare_tenant_item(tenant_row)
+                tenant_repo.add(tenant)
+                transactions = [
+                    transaction
+                    for period, row in transaction_rows
+                    if (transaction := build_transaction(row, period, tenant.id))
+                ]
+                partitions.ensure({transaction.period for transaction in transactions})
+                transaction_repo.bulk_add(transactions)
+                session.commit()
+            except Exception as exc:
+                session.rollback()
+                print(f"Error occurred for Tenant {tenant_row[1]}: {exc}")
+                errors.append(exc)
+                failure.set()
+
+
+def load_data_to_db_pipelined(filename="data/data.xlsx", writers=1, queue_size=64):
+    """
+    Loads a ledger with parsing and database writes overlapping.
+
+    The parser streams the worksheet into a bounded queue of tenant blocks,
+    which writer threads save on their own connections. A full queue blocks
+    the parser, so memory stays bounded whatever the file size. Rows found in
+    the ledger cache are used instead of parsing, but a streamed workbook is
+    not added to it since that would hold every row in memory.
+
+    Args:
+        filename: Path to the ledger workbook.
+        writers: Number of writer threads. SQLite only allows one writer at a
+        time, so use more than one with PostgreSQL.
+        queue_size: Maximum number of tenant blocks waiting to be written.
+    """
+    # Without a writer the parser would block forever on the full queue, and
+    # a queue size of 0 would make the queue unbounded
+    if writers < 1:
+        raise ValueError(f"At least one writer is needed, got {writers}")
+    if queue_size < 1:
+        raise ValueError(f"The queue size must be at least 1, got {queue_size}")
+    engine = db.engine
+    with engine.connect() as connection:
+        partitions = PeriodPartitions(engine, partition_granularity(connection))
+
+    blocks = queue.Queue(maxsize=queue_size)
+    failure = threading.Event()
+    errors = []
+    threads = [
+        threading.Thread(
+            target=write_tenant_blocks,
+            args=(engine, blocks, partitions, failure, errors),
+            name=f"ledger-writer-{index}",
+        )
+        for index in range(writers)
+    ]
+    for thread in threads:
+        thread.start()
+    try:
+        cache = get_ledger_cache()
+        key = cache.key(filename) if cache is not None else None
+        rows = cache.get(key) if key is not None else None
+        if rows is None:
+            rows = stream_ledger_rows(filename, width=LEDGER_WIDTH)
+        for block in iter_tenant_blocks(rows):
+            if failure.is_set():
+                break
+            blocks.put(block)
+    finally:
+        for _ in threads:
+            blocks.put(None)
+        for thread in threads:
+            thread.join()
+    if errors:
+        raise errors[0]
+    recompute_tenant_statuses(engine)
+
+
+def positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load the ledger into the database")
+    parser.add_argument(
+        "--pipeline",
+        action="store_true",
+        help="overlap parsing and database writes",
+    )
+    parser.add_argument("--writers", type=positive_int, default=1)
+    parser.add_argument("--queue-size", type=positive_int, default=64)
+    args = parser.parse_args()
+
     app = create_app()
     with app.app_context():
-        load_data_to_db()
+        if args.pipeline:
+            load_data_to_db_pipelined(writers=args.writers, queue_size=args.queue_size)
+        else:
+            load_data_to_db()
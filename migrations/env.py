@@ -4,6 +4,9 @@ from logging.config import fileConfig
 from alembic import context
 from flask import current_app
 
+from app.models import TENANT_NAME_FTS_TABLE
+from app.partitions import PARTITION_NAME_PATTERN
+
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
 config = context.config
@@ -49,6 +52,29 @@ def get_metadata():
     return target_db.metadata
 
 
+# Indexes declared on the models but only created on PostgreSQL
+POSTGRESQL_ONLY_INDEXES = {"ix_tenants_tenant_name_trgm"}
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    """Leave out of autogenerate the schema objects the models do not describe.
+
+    The SQLite full-text table of tenant names and its shadow tables are
+    created by DDL events, the partitions of tenant_transactions by
+    ``flask partition-transactions``, and the PostgreSQL-only indexes are not
+    created on other databases, so comparing them would drop or add them.
+
+    """
+    if type_ == "table" and reflected and compare_to is None:
+        return not (
+            name.startswith(TENANT_NAME_FTS_TABLE)
+            or PARTITION_NAME_PATTERN.fullmatch(name)
+        )
+    if type_ == "index" and name in POSTGRESQL_ONLY_INDEXES:
+        return context.get_context().dialect.name == "postgresql"
+    return True
+
+
 def run_migrations_offline():
     """Run migrations in 'offline' mode.
 
@@ -62,7 +88,12 @@ def run_migrations_offline():
 
     """
     url = config.get_main_option("sqlalchemy.url")
-    context.configure(url=url, target_metadata=get_metadata(), literal_binds=True)
+    context.configure(
+        url=url,
+        target_metadata=get_metadata(),
+        include_object=include_object,
+        literal_binds=True,
+    )
 
     with context.begin_transaction():
         context.run_migrations()
@@ -93,6 +124,7 @@ def run_migrations_online():
             connection=connection,
             target_metadata=get_metadata(),
             process_revision_directives=process_revision_directives,
+            include_object=include_object,
             **current_app.extensions["migrate"].configure_args
         )
 
@@ -0,0 +1,43 @@
+"""add tenant case-insensitive search indexes
+
+Revision ID: 5f2b9d7e4a13
+Revises: c3a8d5f21b47
+Create Date: 2026-10-20 10:05:00.000000
+
+"""
+from alembic import op
+
+from app.models import TENANT_NAME_FTS_DDL, TENANT_NAME_FTS_TABLE
+
+# revision identifiers, used by Alembic.
+revision = "5f2b9d7e4a13"
+down_revision = "c3a8d5f21b47"
+branch_labels = None
+depends_on = None
+
+COLUMNS = ("tenant_code", "tenant_main_unit_no", "tenant_property_name")
+
+
+def upgrade():
+    for column in COLUMNS:
+        op.execute(
+            f"CREATE INDEX IF NOT EXISTS ix_tenants_{column}_lower "
+            f"ON tenants (lower(trim({column})))"
+        )
+    if op.get_bind().dialect.name == "sqlite":
+        for statement in TENANT_NAME_FTS_DDL:
+            op.execute(statement)
+        # Index the names of the tenants already in the table
+        op.execute(
+            f"INSERT INTO {TENANT_NAME_FTS_TABLE} ({TENANT_NAME_FTS_TABLE}) "
+            "VALUES ('rebuild')"
+        )
+
+
+def downgrade():
+    if op.get_bind().dialect.name == "sqlite":
+        for trigger in ("insert", "delete", "update"):
+            op.execute(f"DROP TRIGGER IF EXISTS {TENANT_NAME_FTS_TABLE}_{trigger}")
+        op.execute(f"DROP TABLE IF EXISTS {TENANT_NAME_FTS_TABLE}")
+    for column in COLUMNS:
+        op.execute(f"DROP INDEX IF EXISTS ix_tenants_{column}_lower")
@@ -0,0 +1,39 @@
+"""add tenant search indexes
+
+Revision ID: 9e7f3c1a5d28
+Revises: 
+Create Date: 2026-10-19 13:40:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "9e7f3c1a5d28"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+BTREE_INDEXES = {
+    "ix_tenants_tenant_code": ("tenants", "tenant_code"),
+    "ix_tenants_tenant_main_unit_no": ("tenants", "tenant_main_unit_no"),
+    "ix_tenants_tenant_property_name": ("tenants", "tenant_property_name"),
+    "ix_tenant_transactions_tenant_id": ("tenant_transactions", "tenant_id"),
+}
+
+
+def upgrade():
+    for name, (table, column) in BTREE_INDEXES.items():
+        op.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({column})")
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        op.execute(
+            "CREATE INDEX IF NOT EXISTS ix_tenants_tenant_name_trgm "
+            "ON tenants USING gin (tenant_name gin_trgm_ops)"
+        )
+
+
+def downgrade():
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_tenants_tenant_name_trgm")
+    for name in BTREE_INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS {name}")
@@ -0,0 +1,49 @@
+"""add tenant lease expired flag
+
+Revision ID: c3a8d5f21b47
+Revises: 9e7f3c1a5d28
+Create Date: 2026-10-19 16:20:00.000000
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "c3a8d5f21b47"
+down_revision = "9e7f3c1a5d28"
+branch_labels = None
+depends_on = None
+
+
+def has_column() -> bool:
+    columns = sa.inspect(op.get_bind()).get_columns("tenants")
+    return any(column["name"] == "tenant_lease_expired" for column in columns)
+
+
+def upgrade():
+    # create_app may already have created the column on a new database
+    if not has_column():
+        op.add_column(
+            "tenants",
+            sa.Column(
+                "tenant_lease_expired",
+                sa.Boolean(),
+                nullable=False,
+                server_default=sa.false(),
+            ),
+        )
+    # Same rules as active_condition and lease_expired_condition
+    op.execute(
+        "UPDATE tenants SET "
+        "tenant_is_active = "
+        "(tenant_vacate_date IS NULL OR tenant_vacate_date > CURRENT_DATE), "
+        "tenant_lease_expired = "
+        "(tenant_lease_end_date IS NOT NULL AND tenant_lease_end_date < CURRENT_DATE)"
+    )
+
+
+def downgrade():
+    if not has_column():
+        return
+    with op.batch_alter_table("tenants") as batch_op:
+        batch_op.drop_column("tenant_lease_expired")
@@ -0,0 +1,300 @@
+import unittest
+from datetime import date
+
+from sqlalchemy import event
+
+from app import create_app
+from app import sqlalchemy as db
+from app.config import TestingConfig
+from app.models import Tenant, TenantTransaction
+
+
+class TestTenantTransactionsEndpoint(unittest.TestCase):
+    """
+    Test class for the tenant transactions endpoint.
+    """
+
+    def setUp(self):
+        """
+        Set up context and database for testing.
+        """
+        self.app = create_app(TestingConfig())
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        self.db = db
+        self.db.create_all()
+
+        tenant = Tenant(tenant_name="yeku", tenant_code="1234", tenant_is_active=True)
+        self.db.session.add(tenant)
+        self.db.session.flush()
+        for period in ["202101", "202102", "202102"]:
+            self.db.session.add(
+                TenantTransaction(
+                    period=period,
+                    date=date(2021, 1, 1),
+                    tax=0,
+                    exclusive=10,
+                    inclusive=10,
+                    tenant_id=tenant.id,
+                )
+            )
+        self.db.session.commit()
+        self.tenant_id = tenant.id
+        self.client = self.app.test_client()
+
+    def tearDown(self):
+        """
+        Clean up context and database after testing.
+        """
+        self.db.session.remove()
+        self.db.drop_all()
+        self.app_context.pop()
+
+    def test_get_all_transactions(self):
+        """
+        Test case for a tenant with all its transactions.
+        """
+        response = self.client.get(f"/api/v1/tenants/{self.tenant_id}/transactions")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.get_json()["transactions"]), 3)
+
+    def test_get_transactions_for_period(self):
+        """
+        Test case for a tenant with the transactions of a single period.
+        """
+        response = self.client.get(
+            f"/api/v1/tenants/{self.tenant_id}/transactions?period=202102"
+        )
+        transactions = response.get_json()["transactions"]
+        self.assertEqual(len(transactions), 2)
+        self.assertTrue(all(txn["period"] == "202102" for txn in transactions))
+
+
+class TestTenantSearchEndpoint(unittest.TestCase):
+    """
+    Test class for the tenant search endpoint.
+    """
+
+    def setUp(self):
+        """
+        Set up context and database for testing.
+        """
+        self.app = create_app(TestingConfig())
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        self.db = db
+        self.db.create_all()
+        self.db.session.add_all(
+            [
+                Tenant(
+                    tenant_name="Lindiwe Mweli",
+                    tenant_code="2897",
+                    tenant_main_unit_no="245",
+                    tenant_property_name="The Museum Tower",
+                ),
+                Tenant(
+                    tenant_name="Lindani Dube",
+                    tenant_code="3001",
+                    tenant_main_unit_no="12A",
+                    tenant_property_name="Harbour View",
+                ),
+            ]
+        )
+        self.db.session.commit()
+        self.client = self.app.test_client()
+
+    def tearDown(self):
+        """
+        Clean up context and database after testing.
+        """
+        self.db.session.remove()
+        self.db.drop_all()
+        self.app_context.pop()
+
+    def test_search_by_name(self):
+        """
+        Test case for a name search returning tenants without transactions.
+        """
+        response = self.client.get("/api/v1/tenants/search?name=lind")
+        tenants = response.get_json()
+        self.assertEqual(
+            [tenant["tenant_name"] for tenant in tenants],
+            ["Lindiwe Mweli", "Lindani Dube"],
+        )
+        self.assertNotIn("transactions", tenants[0])
+
+    def test_search_by_code_and_property(self):
+        """
+        Test case for exact code and property searches.
+        """
+        response = self.client.get("/api/v1/tenants/search?code=3001")
+        self.assertEqual(response.get_json()[0]["tenant_name"], "Lindani Dube")
+        response = self.client.get(
+            "/api/v1/tenants/search?property=The Museum Tower&unit=245"
+        )
+        self.assertEqual(response.get_json()[0]["tenant_code"], "2897")
+
+    def test_search_sees_new_tenants(self):
+        """
+        Test case for the search picking up tenants added after a search.
+        """
+        self.client.get("/api/v1/tenants/search?name=lind")
+        self.db.session.add(Tenant(tenant_name="Lindsay Moyo", tenant_code="3002"))
+        self.db.session.commit()
+        response = self.client.get("/api/v1/tenants/search?name=lindsay")
+        self.assertEqual(response.get_json()[0]["tenant_code"], "3002")
+
+    def test_search_ignores_case(self):
+        """
+        Test case for case-insensitive name words and exact fields.
+        """
+        response = self.client.get("/api/v1/tenants/search?name=LIND+dub&unit=12a")
+        self.assertEqual(
+            [tenant["tenant_code"] for tenant in response.get_json()], ["3001"]
+        )
+
+    def test_search_limit_is_clamped(self):
+        """
+        Test case for a limit below one returning a single tenant.
+        """
+        response = self.client.get("/api/v1/tenants/search?name=lind&limit=-1")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.get_json()), 1)
+
+    def test_search_ignores_blank_filters(self):
+        """
+        Test case for empty parameters left out of the search.
+        """
+        expected = self.client.get("/api/v1/tenants/search?name=lind").get_json()
+        response = self.client.get("/api/v1/tenants/search?name=lind&code=&unit=%20")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(expected)
+        self.assertEqual(response.get_json(), expected)
+        response = self.client.get("/api/v1/tenants/search?code=&property=")
+        self.assertEqual(response.status_code, 400)
+
+    def test_search_without_filters(self):
+        """
+        Test case for a search missing every filter.
+        """
+        response = self.client.get("/api/v1/tenants/search")
+        self.assertEqual(response.status_code, 400)
+
+
+class TestBatchTransactionsEndpoint(unittest.TestCase):
+    """
+    Test class for the batch tenant transactions endpoint.
+    """
+
+    def setUp(self):
+        """
+        Set up context and database for testing.
+        """
+        self.app = create_app(TestingConfig())
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        self.db = db
+        self.db.create_all()
+        self.tenant_ids = []
+        for index in range(5):
+            tenant = Tenant(tenant_name=f"Tenant {index}", tenant_code=f"C{index}")
+            self.db.session.add(tenant)
+            self.db.session.flush()
+            self.tenant_ids.append(tenant.id)
+            for period in ["202101", "202102"]:
+                self.db.session.add(
+                    TenantTransaction(
+                        period=period,
+                        date=date(2021, 1, 1),
+                        tax=0,
+                        exclusive=10,
+                        inclusive=10,
+                        tenant_id=tenant.id,
+                    )
+                )
+        self.db.session.commit()
+        self.client = self.app.test_client()
+
+    def tearDown(self):
+        """
+        Clean up context and database after testing.
+        """
+        self.db.session.remove()
+        self.db.drop_all()
+        self.app_context.pop()
+
+    def test_batch_by_ids_and_codes(self):
+        """
+        Test case for tenants resolved by id and code, with missing ones reported.
+        """
+        response = self.client.post(
+            "/api/v1/tenants/transactions",
+            json={"ids": [self.tenant_ids[0], 999], "codes": ["C3", "UNKNOWN"]},
+        )
+        body = response.get_json()
+        self.assertEqual(
+            [tenant["tenant_code"] for tenant in body["tenants"]], ["C0", "C3"]
+        )
+        self.assertTrue(all(len(t["transactions"]) == 2 for t in body["tenants"]))
+        self.assertEqual(body["missing"], {"ids": [999], "codes": ["UNKNOWN"]})
+
+    def test_batch_uses_constant_number_of_queries(self):
+        """
+        Test case for two queries whatever the number of tenants.
+        """
+        statements = []
+
+        def count(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(self.db.engine, "before_cursor_execute", count)
+        try:
+            response = self.client.post(
+                "/api/v1/tenants/transactions",
+                json={"ids": self.tenant_ids, "period": "202102"},
+            )
+        finally:
+            event.remove(self.db.engine, "before_cursor_execute", count)
+        tenants = response.get_json()["tenants"]
+        self.assertEqual(len(tenants), 5)
+        self.assertTrue(all(len(t["transactions"]) == 1 for t in tenants))
+        self.assertEqual(len(statements), 2)
+
+    def test_batch_invalid_payload(self):
+        """
+        Test case for empty and malformed requests.
+        """
+        url = "/api/v1/tenants/transactions"
+        self.assertEqual(self.client.post(url, json={}).status_code, 400)
+        self.assertEqual(self.client.post(url, json={"ids": ["a"]}).status_code, 400)
+        too_many = {"ids": list(range(1001))}
+        self.assertEqual(self.client.post(url, json=too_many).status_code, 400)
+        invalid_payloads = [
+            [1, 2],
+            "C1",
+            {"ids": [True]},
+            {"ids": [1], "period": [1]},
+            {"codes": [None, {"a": 1}, True, ["x"]]},
+            {"codes": ["C1", None]},
+            {"codes": [False]},
+        ]
+        for payload in invalid_payloads:
+            response = self.client.post(url, json=payload)
+            self.assertEqual(response.status_code, 400, payload)
+        response = self.client.post(url, data="{", content_type="application/json")
+        self.assertEqual(response.status_code, 400)
+
+    def test_batch_numeric_period(self):
+        """
+        Test case for a period sent as a number.
+        """
+        response = self.client.post(
+            "/api/v1/tenants/transactions",
+            json={"codes": ["C1"], "period": 202101},
+        )
+        tenants = response.get_json()["tenants"]
+        self.assertEqual([t["period"] for t in tenants[0]["transactions"]], ["202101"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,191 @@
+import os
+import tempfile
+import unittest
+from datetime import date, datetime, time, timedelta
+from unittest.mock import patch
+
+from app.ledger_cache import LedgerCache, decode_rows, encode_rows, file_digest
+from app.ledger_reader import read_ledger_rows
+from main import load_ledger_data
+
+DATA_FILE = os.path.join(os.path.dirname(__file__), "..", "data", "data.xlsx")
+
+
+def typed(rows):
+    return [[(type(value), value) for value in row] for row in rows]
+
+
+class TestLedgerCacheFormat(unittest.TestCase):
+    """
+    Test class for the binary format of cached rows.
+    """
+
+    def test_round_trip_keeps_values_and_types(self):
+        """
+        Test case for every cell type the ledger reader produces.
+        """
+        rows = [
+            ("Tenant", None, True, False, 202101, -7),
+            (26.52, datetime(2021, 1, 31, 12, 30, 15, 250), date(1999, 12, 31)),
+            (time(8, 15, 30), timedelta(days=2, seconds=5), "Électricité ✓", ""),
+            (None,),
+        ]
+        result = decode_rows(encode_rows(rows))
+        expected = [row + (None,) * (6 - len(row)) for row in rows]
+        self.assertEqual(typed(result), typed(expected))
+
+    def test_round_trip_of_bundled_data(self):
+        """
+        Test case for the rows of data/data.xlsx.
+        """
+        rows = read_ledger_rows(DATA_FILE)
+        self.assertEqual(typed(decode_rows(encode_rows(rows))), typed(rows))
+
+    def test_empty_rows(self):
+        """
+        Test case for a sheet without any row.
+        """
+        self.assertEqual(decode_rows(encode_rows([])), [])
+
+    def test_unsupported_value_is_rejected(self):
+        """
+        Test case for integers that do not fit in 64 bits.
+        """
+        with self.assertRaises(ValueError):
+            encode_rows([(2**70,)])
+
+
+class TestLedgerCache(unittest.TestCase):
+    """
+    Test class for the on-disk ledger cache.
+    """
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.directory = os.path.join(self.folder.name, "cache")
+        self.workbook = os.path.join(self.folder.name, "ledger.xlsx")
+        with open(self.workbook, "wb") as workbook:
+            workbook.write(b"first version")
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def test_get_returns_cached_rows(self):
+        """
+        Test case for a hit on an unchanged file.
+        """
+        cache = LedgerCache(self.directory, 1 << 20)
+        key = cache.key(self.workbook)
+        self.assertIsNone(cache.get(key))
+        self.assertTrue(cache.put(key, [("Tenant", 1)]))
+        self.assertEqual(cache.get(cache.key(self.workbook)), [("Tenant", 1)])
+
+    def test_changed_file_misses(self):
+        """
+        Test case for the cache key following the file content.
+        """
+        cache = LedgerCache(self.directory, 1 << 20)
+        cache.put(cache.key(self.workbook), [("Tenant", 1)])
+        with open(self.workbook, "wb") as workbook:
+            workbook.write(b"second version")
+        self.assertIsNone(cache.get(cache.key(self.workbook)))
+
+    def test_corrupt_file_misses(self):
+        """
+        Test case for a cache file that is not in the expected format.
+        """
+        cache = LedgerCache(self.directory, 1 << 20)
+        key = cache.key(self.workbook)
+        cache.put(key, [("Tenant", 1)])
+        with open(cache.path(key), "wb") as cached:
+            cached.write(b"garbage" * 10)
+        self.assertIsNone(cache.get(key))
+
+    def test_unsupported_rows_are_not_cached(self):
+        """
+        Test case for rows the format cannot represent.
+        """
+        cache = LedgerCache(self.directory, 1 << 20)
+        key = cache.key(self.workbook)
+        self.assertFalse(cache.put(key, [(2**70,)]))
+        self.assertIsNone(cache.get(key))
+
+    def test_missing_file_has_no_key(self):
+        """
+        Test case for a workbook that cannot be read.
+        """
+        cache = LedgerCache(self.directory, 1 << 20)
+        self.assertIsNone(cache.key(os.path.join(self.folder.name, "missing.xlsx")))
+
+    def test_unwritable_directory_is_not_an_error(self):
+        """
+        Test case for a cache directory that cannot be created.
+        """
+        # A file where the directory should be makes os.makedirs fail
+        with open(self.directory, "wb") as blocker:
+            blocker.write(b"")
+        cache = LedgerCache(self.directory, 1 << 20)
+        self.assertFalse(cache.put(cache.key(self.workbook), [("Tenant", 1)]))
+
+    def test_failed_write_leaves_no_temporary_file(self):
+        """
+        Test case for a write failing after the temporary file was created.
+        """
+        cache = LedgerCache(self.directory, 1 << 20)
+        with patch("app.ledger_cache.os.replace", side_effect=OSError("disk full")):
+            self.assertFalse(cache.put(cache.key(self.workbook), [("Tenant", 1)]))
+        self.assertEqual(os.listdir(self.directory), [])
+
+    def test_evicts_least_recently_used(self):
+        """
+        Test case for removing the oldest entries past the size limit.
+        """
+        rows = [("x" * 1000,)]
+        entry_size = len(encode_rows(rows))
+        cache = LedgerCache(self.directory, entry_size * 3)
+        keys = []
+        for index in range(3):
+            workbook = os.path.join(self.folder.name, f"ledger{index}.xlsx")
+            with open(workbook, "wb") as output:
+                output.write(str(index).encode())
+            key = cache.key(workbook)
+            cache.put(key, rows)
+            os.utime(cache.path(key), (index, index))
+            keys.append(key)
+        cache.get(keys[0])
+        cache.max_bytes = entry_size * 2
+        cache.evict()
+        self.assertIsNotNone(cache.get(keys[0]))
+        self.assertIsNone(cache.get(keys[1]))
+        self.assertIsNotNone(cache.get(keys[2]))
+
+    @patch("main.read_ledger_rows", wraps=read_ledger_rows)
+    def test_load_ledger_data_skips_parsing_on_hit(self, mock_read_ledger_rows):
+        """
+        Test case for a second load of the same workbook.
+        """
+        cache = LedgerCache(self.directory, 1 << 30)
+        first = load_ledger_data(DATA_FILE, cache=cache)
+        second = load_ledger_data(DATA_FILE, cache=cache)
+        mock_read_ledger_rows.assert_called_once_with(DATA_FILE)
+        self.assertEqual(typed(second), typed(first))
+
+    @patch("app.ledger_cache.file_digest", wraps=file_digest)
+    def test_load_ledger_data_hashes_once(self, mock_file_digest):
+        """
+        Test case for a cache miss hashing the workbook a single time.
+        """
+        load_ledger_data(DATA_FILE, cache=LedgerCache(self.directory, 1 << 30))
+        mock_file_digest.assert_called_once_with(DATA_FILE)
+
+    def test_load_ledger_data_does_not_cache_unreadable_file(self):
+        """
+        Test case for a workbook neither reader can open.
+        """
+        cache = LedgerCache(self.directory, 1 << 30)
+        self.assertIsNone(load_ledger_data(self.workbook, cache=cache))
+        self.assertFalse(os.path.exists(self.directory))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+import os
+import tempfile
+import tracemalloc
+import unittest
+from datetime import datetime
+from unittest.mock import patch
+
+from openpyxl import Workbook
+
+from app.ledger_reader import iter_ledger_rows, read_ledger_rows
+from main import load_ledger_data, load_workbook_data
+
+DATA_FILE = os.path.join(os.path.dirname(__file__), "..", "data", "data.xlsx")
+
+
+def typed(rows):
+    return [[(type(value), value) for value in row] for row in rows]
+
+
+class TestReadLedgerRows(unittest.TestCase):
+    """
+    Test class for the streaming ledger reader.
+    """
+
+    def test_matches_openpyxl_on_bundled_data(self):
+        """
+        Test case for identical values and types on data/data.xlsx.
+        """
+        expected = load_workbook_data(DATA_FILE)
+        result = read_ledger_rows(DATA_FILE)
+        self.assertEqual(typed(result), typed(expected))
+        self.assertTrue(all(isinstance(row, tuple) for row in result))
+
+    def test_matches_openpyxl_on_sparse_sheet(self):
+        """
+        Test case for missing rows, short rows and mixed cell types.
+        """
+        workbook = Workbook()
+        worksheet = workbook.active
+        worksheet["A1"] = "Period"
+        worksheet["B1"] = True
+        worksheet["A3"] = 202101
+        worksheet["B3"] = datetime(2021, 1, 1)
+        worksheet["C3"] = 26.52
+        worksheet["E5"] = "=SUM(C3:C4)"
+        with tempfile.TemporaryDirectory() as folder:
+            filename = os.path.join(folder, "sparse.xlsx")
+            workbook.save(filename)
+            expected = load_workbook_data(filename)
+            result = read_ledger_rows(filename)
+            streamed = list(iter_ledger_rows(filename, width=5))
+        self.assertEqual(typed(result), typed(expected))
+        self.assertEqual(streamed, result)
+
+    def test_streaming_memory_does_not_grow_with_rows(self):
+        """
+        Test case for the parse tree staying small however long the sheet is.
+        """
+
+        def peak_memory(row_count):
+            workbook = Workbook(write_only=True)
+            worksheet = workbook.create_sheet()
+            for _ in range(row_count):
+                worksheet.append([202101, "Water", 26.52])
+            with tempfile.TemporaryDirectory() as folder:
+                filename = os.path.join(folder, "long.xlsx")
+                workbook.save(filename)
+                tracemalloc.start()
+                try:
+                    for _ in iter_ledger_rows(filename, width=3):
+                        pass
+                    return tracemalloc.get_traced_memory()[1]
+                finally:
+                    tracemalloc.stop()
+
+        self.assertLess(peak_memory(20_000), peak_memory(2_000) * 1.5)
+
+    @patch("main.load_workbook_data")
+    def test_load_ledger_data_falls_back_to_openpyxl(self, mock_load_workbook_data):
+        """
+        Test case for files the streaming reader cannot open.
+        """
+        mock_load_workbook_data.return_value = None
+        result = load_ledger_data("missing_file.xlsx")
+        mock_load_workbook_data.assert_called_once_with("missing_file.xlsx")
+        self.assertIsNone(result)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -8,11 +8,15 @@ from sqlalchemy.orm import Session
 from app import create_app
 from app import sqlalchemy as db
 from app.config import TestingConfig
+from app.ledger_reader import LedgerFormatError, iter_ledger_rows
 from app.models import Tenant, TenantTransaction
 from app.repository.transaction import TenantTransactionRepository
 from main import (
+    LEDGER_WIDTH,
     convert_tenant_row_to_dict,
+    iter_tenant_blocks,
     load_data_to_db,
+    load_data_to_db_pipelined,
     load_workbook_data,
     prepare_tenant_item,
     process_transaction,
@@ -142,6 +146,18 @@ class TestTenantDataConversion(unittest.TestCase):
         )
         self.assertEqual(result.tenant_name, expected.tenant_name)
 
+    def test_prepare_tenant_item_flags(self):
+        """
+        Test case for the active and lease expired flags of a tenant leaving
+        after the end of their lease.
+        """
+        row = ["Tenant", "yeku", "Code", "1234", "Main Unit No", "1", "Property"]
+        row += ["Tower", "Telephone", None, "Ends", datetime(2020, 1, 31)]
+        row += ["Vacate", datetime(2999, 1, 31)]
+        result = prepare_tenant_item(row)
+        self.assertTrue(result.tenant_is_active)
+        self.assertTrue(result.tenant_lease_expired)
+
 
 class TestTransactionProcessing(unittest.TestCase):
     """
@@ -262,7 +278,7 @@ class TestLoadDataToDB(unittest.TestCase):
         self.db.drop_all()
         self.app_context.pop()
 
-    @patch("main.load_workbook_data")
+    @patch("main.load_ledger_data")
     @patch("main.TenantRepository")
     @patch("main.TenantTransactionRepository")
     def test_load_data_to_db(
@@ -329,5 +345,130 @@ class TestLoadDataToDB(unittest.TestCase):
             self.assertEqual(created_transaction.date, datetime(2022, 1, 1).date())
             self.assertEqual(created_transaction.transaction, "transaction")
 
+
+class TestIterTenantBlocks(unittest.TestCase):
+    """
+    Test class for iter_tenant_blocks() function.
+    """
+
+    def test_blocks_fill_missing_periods(self):
+        """
+        Test case for grouping rows per tenant and filling empty periods.
+        """
+        rows = [
+            ("Period", "Date"),
+            ("Tenant", "yeku"),
+            (202101.0, "a"),
+            (None, "b"),
+            ("Tenant", "mweli"),
+            (None, "c"),
+        ]
+        blocks = list(iter_tenant_blocks(rows))
+        self.assertEqual(len(blocks), 2)
+        self.assertEqual(blocks[0][0], ("Tenant", "yeku"))
+        self.assertEqual([period for period, _ in blocks[0][1]], [202101.0, 202101.0])
+        # The period carries over to the next tenant, like in load_data_to_db
+        self.assertEqual(blocks[1][1], [(202101.0, (None, "c"))])
+
+
+class TestLoadDataToDBPipelined(unittest.TestCase):
+    """
+    Test class for load_data_to_db_pipelined() function.
+    """
+
+    def setUp(self):
+        """
+        Set up context and database for testing.
+        """
+        self.app = create_app(TestingConfig())
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        self.db = db
+        self.db.create_all()
+
+    def tearDown(self):
+        """
+        Clean up context and database after testing.
+        """
+        self.db.session.remove()
+        self.db.drop_all()
+        self.app_context.pop()
+
+    def test_matches_sequential_load(self):
+        """
+        Test case for the pipelined load writing the same rows as load_data_to_db.
+        """
+        load_data_to_db_pipelined("data/data.xlsx", queue_size=4)
+        pipelined = self.snapshot()
+
+        self.db.drop_all()
+        self.db.create_all()
+        load_data_to_db("data/data.xlsx")
+        self.assertEqual(pipelined, self.snapshot())
+        self.assertEqual(len(pipelined), 7761)
+
+    @patch("main.prepare_tenant_item")
+    def test_writer_error_is_raised(self, mock_prepare_tenant_item):
+        """
+        Test case for a failing writer stopping the load and raising its error.
+        """
+        mock_prepare_tenant_item.side_effect = ValueError("bad tenant row")
+        with self.assertRaises(ValueError):
+            load_data_to_db_pipelined("data/data.xlsx", queue_size=2)
+        self.assertEqual(self.db.session.query(Tenant).count(), 0)
+
+    def test_falls_back_to_openpyxl(self):
+        """
+        Test case for the streaming reader failing before and during the load.
+        """
+        load_data_to_db("data/data.xlsx")
+        expected = self.snapshot()
+        rows = list(iter_ledger_rows("data/data.xlsx", width=LEDGER_WIDTH))
+
+        def failing_reader(filename, width):
+            yield from rows[:failing_row]
+            raise LedgerFormatError("Unsupported shared formula")
+
+        for failing_row in (0, 5000):
+            with self.subTest(failing_row=failing_row):
+                self.db.drop_all()
+                self.db.create_all()
+                with patch("main.iter_ledger_rows", failing_reader):
+                    load_data_to_db_pipelined("data/data.xlsx", queue_size=4)
+                self.assertEqual(self.snapshot(), expected)
+
+    def test_writers_and_queue_size_must_be_positive(self):
+        """
+        Test case for settings that would hang the load or unbound the queue.
+        """
+        for settings in ({"writers": 0}, {"queue_size": 0}, {"queue_size": -1}):
+            with self.subTest(**settings):
+                with self.assertRaises(ValueError):
+                    load_data_to_db_pipelined("data/data.xlsx", **settings)
+        self.assertEqual(self.db.session.query(Tenant).count(), 0)
+
+    def test_unreadable_file_is_raised(self):
+        """
+        Test case for a file neither reader can open.
+        """
+        with self.assertRaises(OSError):
+            load_data_to_db_pipelined("missing_file.xlsx")
+
+    def snapshot(self):
+        rows = (
+            self.db.session.query(
+                Tenant.tenant_code,
+                TenantTransaction.period,
+                TenantTransaction.date,
+                TenantTransaction.description,
+                TenantTransaction.inclusive,
+            )
+            .join(TenantTransaction, TenantTransaction.tenant_id == Tenant.id)
+            .all()
+        )
+        self.db.session.remove()
+        return sorted(rows, key=repr)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,270 @@
+import os
+import unittest
+from datetime import date
+
+from sqlalchemy import event, text
+
+from app import create_app
+from app import sqlalchemy as db
+from app.config import TestingConfig
+from app.models import Tenant, TenantTransaction
+from app.partitions import (
+    PARTITION_NAME_PATTERN,
+    drop_partition,
+    ensure_partition,
+    is_partitioned,
+    partition_bounds,
+    partition_granularity,
+    partition_name,
+    partition_table,
+)
+from main import ensure_period_partitions
+
+POSTGRES_TEST_URL = os.environ.get("POSTGRES_TEST_URL")
+
+
+class TestPartitionBounds(unittest.TestCase):
+    """
+    Test class for partition_bounds() and partition_name() functions.
+    """
+
+    def test_monthly_bounds(self):
+        """
+        Test case for a monthly partition, including the year rollover.
+        """
+        self.assertEqual(partition_bounds("202101", "monthly"), ("202101", "202102"))
+        self.assertEqual(partition_bounds(202112, "monthly"), ("202112", "202201"))
+
+    def test_yearly_bounds(self):
+        """
+        Test case for a yearly partition covering every month of the year.
+        """
+        lower, upper = partition_bounds("202107", "yearly")
+        self.assertEqual((lower, upper), ("2021", "2022"))
+        self.assertTrue(lower <= "202101" < upper)
+        self.assertTrue(lower <= "202112" < upper)
+
+    def test_unknown_granularity(self):
+        """
+        Test case for an unsupported granularity.
+        """
+        with self.assertRaises(ValueError):
+            partition_bounds("202101", "weekly")
+
+    def test_partition_name(self):
+        """
+        Test case for the partition table names.
+        """
+        self.assertEqual(
+            partition_name("202103", "monthly"), "tenant_transactions_p202103"
+        )
+        self.assertEqual(partition_name("202103", "yearly"), "tenant_transactions_p2021")
+        for granularity in ("monthly", "yearly"):
+            name = partition_name("202103", granularity)
+            self.assertTrue(PARTITION_NAME_PATTERN.fullmatch(name))
+        self.assertFalse(PARTITION_NAME_PATTERN.fullmatch("tenant_transactions"))
+
+
+class TestPartitionTransactionsCommand(unittest.TestCase):
+    """
+    Test class for the flask partition-transactions command.
+    """
+
+    def setUp(self):
+        """
+        Set up context and database for testing.
+        """
+        self.app = create_app(TestingConfig())
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        self.db = db
+        self.db.create_all()
+
+    def tearDown(self):
+        """
+        Clean up context and database after testing.
+        """
+        self.db.session.remove()
+        self.db.drop_all()
+        self.app_context.pop()
+
+    @unittest.skipIf(POSTGRES_TEST_URL, "only checks the SQLite error")
+    def test_requires_postgresql(self):
+        """
+        Test case for a database that does not support partitioning.
+        """
+        runner = self.app.test_cli_runner()
+        result = runner.invoke(
+            args=["partition-transactions", "--granularity", "monthly"]
+        )
+        self.assertNotEqual(result.exit_code, 0)
+        self.assertIn("requires PostgreSQL", result.output)
+
+
+class PostgresPartitionConfig(TestingConfig):
+    SQLALCHEMY_DATABASE_URI = POSTGRES_TEST_URL
+    TRANSACTION_PARTITIONING = "monthly"
+
+
+@unittest.skipUnless(POSTGRES_TEST_URL, "POSTGRES_TEST_URL is not set")
+class TestPostgresPartitioning(unittest.TestCase):
+    """
+    Test class for the partitioned tenant_transactions table on PostgreSQL.
+    """
+
+    def setUp(self):
+        """
+        Set up a partitioned table holding one tenant over three periods.
+        """
+        self.app = create_app(PostgresPartitionConfig())
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        self.db = db
+        self.db.create_all()
+
+        connection = self.db.session.connection()
+        partition_table(connection, "monthly")
+        self.periods = ["202101", "202102", "202103"]
+        for period in self.periods:
+            ensure_partition(connection, period, "monthly")
+
+        tenant = Tenant(tenant_name="yeku", tenant_is_active=True)
+        self.db.session.add(tenant)
+        self.db.session.flush()
+        for period in self.periods:
+            self.db.session.add(
+                TenantTransaction(
+                    period=period,
+                    date=date(2021, 1, 1),
+                    tax=0,
+                    exclusive=10,
+                    inclusive=10,
+                    tenant_id=tenant.id,
+                )
+            )
+        self.db.session.commit()
+        self.tenant_id = tenant.id
+
+    def tearDown(self):
+        """
+        Clean up context and database after testing.
+        """
+        self.db.session.remove()
+        with self.db.engine.begin() as connection:
+            connection.execute(text("DROP TABLE IF EXISTS tenant_transactions CASCADE"))
+        self.db.drop_all()
+        self.app_context.pop()
+
+    def test_table_is_partitioned(self):
+        """
+        Test case for the table conversion.
+        """
+        self.assertTrue(is_partitioned(self.db.session.connection()))
+
+    def test_granularity_is_read_from_the_table(self):
+        """
+        Test case for new partitions following the recorded granularity
+        rather than TRANSACTION_PARTITIONING.
+        """
+        connection = self.db.session.connection()
+        self.assertEqual(partition_granularity(connection), "monthly")
+        # A yearly 2021 partition would overlap the monthly ones of 2021
+        for configured, period in ((None, "202204"), ("yearly", "202104")):
+            with self.subTest(configured=configured):
+                self.app.config["TRANSACTION_PARTITIONING"] = configured
+                ensure_period_partitions(self.db.session, {period})
+                self.db.session.add(
+                    TenantTransaction(
+                        period=period,
+                        date=date(2021, 1, 1),
+                        tax=0,
+                        exclusive=10,
+                        inclusive=10,
+                        tenant_id=self.tenant_id,
+                    )
+                )
+                self.db.session.commit()
+        for name in ("tenant_transactions_p202204", "tenant_transactions_p202104"):
+            exists = self.db.session.execute(
+                text("SELECT to_regclass(:name)"), {"name": name}
+            ).scalar()
+            self.assertIsNotNone(exists, name)
+
+    def test_command_reverts_and_partitions(self):
+        """
+        Test case for the flask partition-transactions command.
+        """
+        self.db.session.commit()
+        runner = self.app.test_cli_runner()
+        result = runner.invoke(args=["partition-transactions", "--revert"])
+        self.assertEqual(result.exit_code, 0, result.output)
+        with self.db.engine.connect() as connection:
+            self.assertFalse(is_partitioned(connection))
+        result = runner.invoke(
+            args=["partition-transactions", "--granularity", "monthly"]
+        )
+        self.assertEqual(result.exit_code, 0, result.output)
+        with self.db.engine.connect() as connection:
+            self.assertTrue(is_partitioned(connection))
+            count = connection.execute(
+                text("SELECT count(*) FROM tenant_transactions")
+            ).scalar()
+        self.assertEqual(count, 3)
+
+    def test_period_query_prunes_partitions(self):
+        """
+        Test case for a per-period API query only scanning its own partition.
+        """
+        statements = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            if "FROM tenant_transactions" in statement:
+                statements.append((statement, parameters))
+
+        event.listen(self.db.engine, "before_cursor_execute", capture)
+        try:
+            response = self.app.test_client().get(
+                f"/api/v1/tenants/{self.tenant_id}/transactions?period=202102"
+            )
+        finally:
+            event.remove(self.db.engine, "before_cursor_execute", capture)
+
+        self.assertEqual(len(response.get_json()["transactions"]), 1)
+        self.assertEqual(len(statements), 1)
+        statement, parameters = statements[0]
+        cursor = self.db.engine.raw_connection().cursor()
+        cursor.execute("EXPLAIN " + statement, parameters)
+        plan = "\n".join(row[0] for row in cursor.fetchall())
+        self.assertIn("tenant_transactions_p202102", plan)
+        self.assertNotIn("tenant_transactions_p202101", plan)
+        self.assertNotIn("tenant_transactions_p202103", plan)
+
+    def test_drop_partition_is_metadata_only(self):
+        """
+        Test case for dropping a period through DDL rather than row deletes.
+        """
+        statements = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        connection = self.db.session.connection()
+        event.listen(connection, "before_cursor_execute", capture)
+        dropped = drop_partition(connection, "202101", "monthly")
+        event.remove(connection, "before_cursor_execute", capture)
+        self.db.session.commit()
+
+        self.assertEqual(dropped, "tenant_transactions_p202101")
+        self.assertFalse(any(s.lstrip().upper().startswith("DELETE") for s in statements))
+        periods = self.db.session.execute(
+            text("SELECT DISTINCT period FROM tenant_transactions ORDER BY period")
+        ).scalars().all()
+        self.assertEqual(periods, ["202102", "202103"])
+        remaining = self.db.session.execute(
+            text("SELECT to_regclass('tenant_transactions_p202101')")
+        ).scalar()
+        self.assertIsNone(remaining)
+
+
+if __name__ == "__main__":
+    unittest.main()
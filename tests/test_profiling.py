@@ -0,0 +1,103 @@
+import unittest
+
+from flask import jsonify
+from sqlalchemy.exc import OperationalError
+
+from app import create_app
+from app import sqlalchemy as db
+from app.config import TestingConfig
+from app.models import Tenant
+
+
+class ProfilingConfig(TestingConfig):
+    SQL_PROFILING = True
+    SQL_PROFILING_SLOW_QUERY_MS = 10_000
+    SQL_PROFILING_REPEAT_THRESHOLD = 2
+
+
+class SlowQueryConfig(ProfilingConfig):
+    SQL_PROFILING_SLOW_QUERY_MS = 0
+
+
+class TestSqlProfiling(unittest.TestCase):
+    """
+    Test class for the per-request SQL profiling.
+    """
+
+    def setUp(self):
+        """
+        Set up context and database for testing.
+        """
+        self.app = create_app(ProfilingConfig())
+
+        @self.app.route("/repeated")
+        def repeated_queries():
+            names = [db.session.get(Tenant, tenant_id) for tenant_id in range(1, 5)]
+            return jsonify(len(names))
+
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        self.db = db
+        self.db.create_all()
+        tenant = Tenant(tenant_name="yeku", tenant_is_active=True)
+        self.db.session.add(tenant)
+        self.db.session.commit()
+        self.tenant_id = tenant.id
+        self.client = self.app.test_client()
+
+    def tearDown(self):
+        """
+        Clean up context and database after testing.
+        """
+        self.db.session.remove()
+        self.db.drop_all()
+        self.app_context.pop()
+
+    def test_server_timing_header(self):
+        """
+        Test case for the db, serialize and total timings of a request.
+        """
+        response = self.client.get(f"/api/v1/tenants/{self.tenant_id}/transactions")
+        header = response.headers["Server-Timing"]
+        self.assertIn('desc="2 queries"', header)
+        for metric in ("db;dur=", "serialize;dur=", "total;dur="):
+            self.assertIn(metric, header)
+
+    def test_repeated_statement_warning(self):
+        """
+        Test case for a statement executed more often than the threshold.
+        """
+        with self.assertLogs(self.app.logger, level="WARNING") as logs:
+            self.client.get("/repeated")
+        self.assertTrue(any("executed 4 times" in line for line in logs.output))
+
+    def test_slow_query_logged_with_parameters(self):
+        """
+        Test case for a query slower than the threshold.
+        """
+        slow_app = create_app(SlowQueryConfig())
+        with self.assertLogs(slow_app.logger, level="WARNING") as logs:
+            slow_app.test_client().get(f"/api/v1/tenants/{self.tenant_id}/transactions")
+        self.assertTrue(
+            any(
+                "Slow query" in line and f"({self.tenant_id}," in line
+                for line in logs.output
+            )
+        )
+
+    def test_failing_statement_leaves_connection_unchanged(self):
+        """
+        Test case for a statement raising between the profiling events.
+        """
+        with self.db.engine.connect() as connection:
+            info = repr(connection.info)
+            for _ in range(3):
+                with self.assertRaises(OperationalError):
+                    connection.exec_driver_sql("SELECT * FROM missing_table")
+            self.assertEqual(repr(connection.info), info)
+        response = self.client.get(f"/api/v1/tenants/{self.tenant_id}/transactions")
+        self.assertIn('desc="2 queries"', response.headers["Server-Timing"])
+
+
+if __name__ == "__main__":
+    unittest.main()
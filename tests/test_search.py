@@ -0,0 +1,144 @@
+import unittest
+
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from app import create_app
+from app import sqlalchemy as db
+from app.config import TestingConfig
+from app.models import Tenant
+from app.repository.tenants import TenantRepository
+from app.search import fts_prefix_query, search_statement
+
+
+class TestTenantSearch(unittest.TestCase):
+    """
+    Test class for TenantRepository.search() on SQLite.
+    """
+
+    def setUp(self):
+        """
+        Set up context and database for testing.
+        """
+        self.app = create_app(TestingConfig())
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        self.db = db
+        self.db.create_all()
+        rows = [
+            ("(Staff) Lindiwe Mweli", "2897", "245", "The Museum Tower"),
+            ("Lindani Dube", "3001", "12A", "Harbour View"),
+            ("Museum Cafe", "3002", "G01", " The Museum Tower "),
+        ]
+        for name, code, unit, property_name in rows:
+            self.db.session.add(
+                Tenant(
+                    tenant_name=name,
+                    tenant_code=code,
+                    tenant_main_unit_no=unit,
+                    tenant_property_name=property_name,
+                )
+            )
+        self.db.session.commit()
+        self.tenant_repo = TenantRepository(self.db.session)
+
+    def tearDown(self):
+        """
+        Clean up context and database after testing.
+        """
+        self.db.session.remove()
+        self.db.drop_all()
+        self.app_context.pop()
+
+    def codes(self, **filters) -> list[str]:
+        return [tenant["tenant_code"] for tenant in self.tenant_repo.search(**filters)]
+
+    def test_name_prefix(self):
+        """
+        Test case for matching the start of a word of the name for every word.
+        """
+        self.assertEqual(self.codes(name="lind"), ["2897", "3001"])
+        self.assertEqual(self.codes(name="MWE"), ["2897"])
+        self.assertEqual(self.codes(name="lind dub"), ["3001"])
+        self.assertEqual(self.codes(name="ndiwe"), [])
+        self.assertEqual(self.codes(name="xyz"), [])
+        self.assertEqual(self.codes(name="--"), [])
+
+    def test_exact_fields(self):
+        """
+        Test case for exact, case-insensitive matches on code, unit and property.
+        """
+        self.assertEqual(self.codes(code="2897"), ["2897"])
+        self.assertEqual(self.codes(unit="12a"), ["3001"])
+        self.assertEqual(self.codes(property="the museum tower"), ["2897", "3002"])
+        self.assertEqual(self.codes(property="The Museum"), [])
+
+    def test_combined_filters(self):
+        """
+        Test case for several filters narrowing down the result.
+        """
+        self.assertEqual(
+            self.codes(name="museum", property="The Museum Tower"), ["3002"]
+        )
+
+    def test_renamed_and_deleted_tenants(self):
+        """
+        Test case for the full-text table following updates and deletions.
+        """
+        tenant = self.db.session.scalars(
+            select(Tenant).filter_by(tenant_code="3001")
+        ).one()
+        tenant.tenant_name = "Sipho Nkosi"
+        self.db.session.commit()
+        self.assertEqual(self.codes(name="lind"), ["2897"])
+        self.assertEqual(self.codes(name="sip"), ["3001"])
+        self.db.session.delete(tenant)
+        self.db.session.commit()
+        self.assertEqual(self.codes(name="sip"), [])
+
+    def test_limit(self):
+        """
+        Test case for the number of tenants returned.
+        """
+        self.assertEqual(self.codes(name="lind", limit=1), ["2897"])
+
+
+class TestSearchConditions(unittest.TestCase):
+    """
+    Test class for the search query used on PostgreSQL.
+    """
+
+    def compile(self, stmt) -> str:
+        return str(stmt.compile(dialect=postgresql.dialect()))
+
+    def test_name_words_and_exact_fields(self):
+        """
+        Test case for one word prefix condition per word and lowercase fields.
+        """
+        sql = self.compile(search_statement("postgresql", "Lind dub", unit="12A"))
+        self.assertEqual(sql.count("tenants.tenant_name ~*"), 2)
+        self.assertIn("lower(trim(tenants.tenant_main_unit_no))", sql)
+
+    def test_empty_exact_fields_are_ignored(self):
+        """
+        Test case for exact fields given without a value.
+        """
+        sql = self.compile(search_statement("postgresql", "Lind", code="", unit=None))
+        self.assertNotIn("tenant_code", sql.split("WHERE")[1])
+        self.assertNotIn("tenant_main_unit_no", sql.split("WHERE")[1])
+
+    def test_name_without_words(self):
+        """
+        Test case for a name matching nothing.
+        """
+        self.assertIsNone(search_statement("postgresql", "--"))
+
+    def test_fts_prefix_query(self):
+        """
+        Test case for quoting the words of an FTS5 prefix query.
+        """
+        self.assertEqual(fts_prefix_query(["dub", "lind"]), '"dub"* "lind"*')
+
+
+if __name__ == "__main__":
+    unittest.main()
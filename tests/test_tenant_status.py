@@ -0,0 +1,133 @@
+import unittest
+from datetime import date, datetime
+
+from app import create_app
+from app import sqlalchemy as db
+from app.config import TestingConfig
+from app.models import Tenant
+from app.tenant_status import recompute_tenant_statuses, tenant_flags
+
+TODAY = date(2024, 6, 15)
+
+
+class TestRecomputeTenantStatuses(unittest.TestCase):
+    """
+    Test class for the bulk recomputation of tenant flags.
+    """
+
+    def setUp(self):
+        """
+        Set up context and database for testing.
+        """
+        self.app = create_app(TestingConfig())
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        self.db = db
+        self.db.create_all()
+
+        tenants = {
+            "current": Tenant(tenant_lease_end_date=date(2025, 1, 31)),
+            "expired": Tenant(tenant_lease_end_date=date(2024, 6, 14)),
+            "ends_today": Tenant(tenant_lease_end_date=TODAY),
+            "vacated": Tenant(
+                tenant_vacate_date=date(2024, 3, 1), tenant_is_active=True
+            ),
+            "leaving": Tenant(tenant_vacate_date=date(2024, 7, 1)),
+            "no_dates": Tenant(),
+        }
+        for tenant_id, (name, tenant) in enumerate(tenants.items(), start=1):
+            # Leave gaps between ids so that some batches are empty
+            tenant.id = tenant_id * 3
+            tenant.tenant_name = name
+            self.db.session.add(tenant)
+        self.db.session.commit()
+
+    def tearDown(self):
+        """
+        Clean up context and database after testing.
+        """
+        self.db.session.remove()
+        self.db.drop_all()
+        self.app_context.pop()
+
+    def flags(self) -> dict:
+        self.db.session.expire_all()
+        return {
+            tenant.tenant_name: (tenant.tenant_is_active, tenant.tenant_lease_expired)
+            for tenant in self.db.session.query(Tenant)
+        }
+
+    def test_recompute_flags(self):
+        """
+        Test case for the active and lease expired flags of every tenant.
+        """
+        updated = recompute_tenant_statuses(self.db.engine, today=TODAY, batch_size=2)
+        self.assertEqual(
+            self.flags(),
+            {
+                "current": (True, False),
+                "expired": (True, True),
+                "ends_today": (True, False),
+                "vacated": (False, False),
+                "leaving": (True, False),
+                "no_dates": (True, False),
+            },
+        )
+        self.assertEqual(updated, 6)
+
+    def test_only_changed_rows_are_updated(self):
+        """
+        Test case for a second run and a run once time has passed.
+        """
+        recompute_tenant_statuses(self.db.engine, today=TODAY)
+        self.assertEqual(recompute_tenant_statuses(self.db.engine, today=TODAY), 0)
+        updated = recompute_tenant_statuses(self.db.engine, today=date(2024, 7, 2))
+        self.assertEqual(updated, 2)
+        self.assertEqual(self.flags()["leaving"], (False, False))
+        self.assertEqual(self.flags()["ends_today"], (True, True))
+
+    def test_empty_table(self):
+        """
+        Test case for a database without tenants.
+        """
+        self.db.session.query(Tenant).delete()
+        self.db.session.commit()
+        self.assertEqual(recompute_tenant_statuses(self.db.engine, today=TODAY), 0)
+
+    def test_tenant_flags_match_recompute(self):
+        """
+        Test case for the flags computed at ingest time agreeing with the
+        bulk recomputation.
+        """
+        recompute_tenant_statuses(self.db.engine, today=TODAY)
+        for tenant in self.db.session.query(Tenant):
+            with self.subTest(tenant=tenant.tenant_name):
+                self.assertEqual(
+                    tenant_flags(
+                        tenant.tenant_lease_end_date,
+                        tenant.tenant_vacate_date,
+                        today=TODAY,
+                    ),
+                    (tenant.tenant_is_active, tenant.tenant_lease_expired),
+                )
+        # Dates read by openpyxl are datetimes
+        flags = tenant_flags(datetime(2024, 6, 14), datetime(2024, 6, 15, 9), TODAY)
+        self.assertEqual(flags, (False, True))
+
+    def test_refresh_tenant_status_command(self):
+        """
+        Test case for the flask refresh-tenant-status command.
+        """
+        runner = self.app.test_cli_runner()
+        result = runner.invoke(
+            args=["refresh-tenant-status", "--today", "2024-06-15", "--batch-size", "4"]
+        )
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn("Updated 6 tenants", result.output)
+        self.assertEqual(self.flags()["expired"], (True, True))
+        result = runner.invoke(args=["refresh-tenant-status", "--batch-size", "0"])
+        self.assertEqual(result.exit_code, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()